@@ -0,0 +1,24 @@
+import os
+import json
+import http.client
+
+# Where the service's API listens unless API_HOST/API_PORT say otherwise
+DEFAULT_API_HOST = "127.0.0.1"
+DEFAULT_API_PORT = 8000
+
+def get_api_address() -> tuple:
+    """(host, port) of the local API; port 0 disables it"""
+    return os.getenv('API_HOST', DEFAULT_API_HOST), int(os.getenv('API_PORT', str(DEFAULT_API_PORT)))
+
+def request_sync(timeout=10) -> dict:
+    """POST /sync to the running service and return its scheduler status"""
+    host, port = get_api_address()
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("POST", "/sync")
+        response = connection.getresponse()
+        if response.status != 202:
+            raise RuntimeError(f"POST /sync returned HTTP {response.status}")
+        return json.load(response)
+    finally:
+        connection.close()
@@ -0,0 +1,250 @@
+import os
+import json
+import gzip
+import asyncio
+import hashlib
+import logging
+import threading
+from urllib.parse import urlsplit, unquote
+from apiclient import get_api_address
+from blobstore import BlobStore, BLOBS_DIR
+from boards import get_boards
+
+# Idle keep-alive connections are closed after this many seconds
+KEEP_ALIVE_SECONDS = 15
+
+# Smaller bodies are sent as they are; gzip would barely shrink them
+MIN_GZIP_BYTES = 256
+
+# Requests with a larger body are refused; POST /sync takes none
+MAX_BODY_BYTES = 65536
+
+REASONS = {200: "OK", 202: "Accepted", 204: "No Content", 304: "Not Modified", 400: "Bad Request",
+           404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+# The Site (and its admin page) call the API from the browser
+CORS_HEADERS = [
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, HEAD, POST, OPTIONS"),
+    ("Access-Control-Allow-Headers", "Content-Type, If-None-Match"),
+    ("Access-Control-Expose-Headers", "ETag"),
+]
+
+class Resource:
+    """A JSON response body with its ETag and a gzip variant compressed on first use"""
+
+    def __init__(self, content):
+        self.body = json.dumps(content, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:20]}"'
+        self._gzipped = None
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzipped
+
+class JobIndex:
+    """Immutable snapshot of every board's exported jobs, swapped in whole after a sync"""
+
+    def __init__(self, boards):
+        self.jobs = {}
+        self.stores = {}
+        all_jobs = []
+        last_updated = None
+        for board in boards:
+            try:
+                with open(os.path.join(board["outDir"], 'jobs.json'), 'r', encoding='utf-8') as f:
+                    content = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"No jobs loaded for board {board['slug']}: {e}")
+                continue
+            store = BlobStore(os.path.join(board["outDir"], BLOBS_DIR))
+            for job in content.get("jobs", []):
+                if len(boards) > 1:
+                    job = dict(job, board=board["slug"])
+                all_jobs.append(job)
+                self.jobs[job["jobviteId"]] = job
+                self.stores[job["jobviteId"]] = store
+            last_updated = max(filter(None, [last_updated, content.get("lastUpdated")]), default=None)
+
+        self.listing = Resource({"jobs": all_jobs, "lastUpdated": last_updated})
+        self.listing.gzipped  # Compressed here, off the event loop
+        self.details = {}
+        self.lock = threading.Lock()
+
+    def detail(self, jobvite_id):
+        """A job with its description inlined, built once per snapshot; None if unknown"""
+        job = self.jobs.get(jobvite_id)
+        if job is None:
+            return None
+        with self.lock:
+            resource = self.details.get(jobvite_id)
+        if resource is None:
+            try:
+                description = self.stores[jobvite_id].get(job.get("descriptionHashes", []))
+            except OSError:
+                description = ""  # GC'd under a stale snapshot; the next reload fixes it
+            resource = Resource(dict(job, jobDescription=description))
+            with self.lock:
+                self.details[jobvite_id] = resource
+        return resource
+
+def _accepts_gzip(header) -> bool:
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+class ApiServer:
+    """Asyncio HTTP/1.1 server for the Site's API, on its own event loop thread
+
+    GET /jobs and GET /jobs/{id} answer from an in-memory JobIndex with ETags and gzip;
+    POST /sync queues a run on the scheduler and returns at once; GET /sync is its status.
+    """
+
+    def __init__(self, scheduler, host, port, boards=None):
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.boards = boards or get_boards()
+        self.index = JobIndex(self.boards)
+        self.loop = None
+        self.server = None
+        self.ready = threading.Event()
+
+    def reload(self):
+        """Build a fresh index from the exported files and swap it in; readers never see a mix"""
+        index = JobIndex(self.boards)
+        self.index = index
+        logging.info(f"API index reloaded: {len(index.jobs)} jobs")
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self.ready.wait()
+        if self.server is None:
+            raise OSError(f"could not listen on {self.host}:{self.port}")
+        return self
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        except OSError as e:
+            logging.error(f"API server failed to start: {e}")
+            self.ready.set()
+            return
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        self.loop.run_forever()
+
+    def close(self):
+        if self.loop is not None and self.server is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_SECONDS)
+                if not request_line.strip():
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    await self._send(writer, "GET", 400, [], {"error": "bad request"}, keep_alive=False)
+                    break
+                method, target, version = parts
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_SECONDS)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._send(writer, method, 413, [], {"error": "body too large"}, keep_alive=False)
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                status, extra_headers, content = self._route(method, target, headers)
+                await self._send(writer, method, status, extra_headers, content, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, method, target, headers):
+        """Return (status, headers, content); content is a Resource, a dict or None"""
+        path = unquote(urlsplit(target).path).rstrip("/") or "/"
+        if method == "OPTIONS":
+            return 204, [], None
+
+        if path == "/sync":
+            if method == "POST":
+                logging.info("Sync requested through the API")
+                return 202, [], self.scheduler.trigger("api")
+            if method in ("GET", "HEAD"):
+                return 200, [], self.scheduler.status()
+            return 405, [("Allow", "GET, HEAD, POST, OPTIONS")], {"error": "method not allowed"}
+
+        if path == "/jobs" or path.startswith("/jobs/"):
+            if method not in ("GET", "HEAD"):
+                return 405, [("Allow", "GET, HEAD, OPTIONS")], {"error": "method not allowed"}
+            index = self.index  # One snapshot for the whole request
+            if path == "/jobs":
+                return 200, [], index.listing
+            resource = index.detail(path[len("/jobs/"):])
+            if resource is None:
+                return 404, [], {"error": "job not found"}
+            return 200, [], resource
+
+        return 404, [], {"error": "not found"}
+
+    async def _send(self, writer, method, status, extra_headers, content, request_headers=None, keep_alive=True):
+        request_headers = request_headers or {}
+        response_headers = list(CORS_HEADERS) + list(extra_headers)
+        body = b""
+        if isinstance(content, Resource):
+            # Clients revalidate every time; an unchanged index costs them a 304 and no body
+            response_headers += [("ETag", content.etag), ("Cache-Control", "no-cache"), ("Vary", "Accept-Encoding")]
+            if_none_match = request_headers.get("if-none-match", "")
+            if if_none_match.strip() == "*" or content.etag in [tag.strip() for tag in if_none_match.split(",")]:
+                status = 304
+            else:
+                body = content.body
+                if len(body) >= MIN_GZIP_BYTES and _accepts_gzip(request_headers.get("accept-encoding", "")):
+                    body = content.gzipped
+                    response_headers.append(("Content-Encoding", "gzip"))
+        elif content is not None:
+            body = json.dumps(content).encode('utf-8')
+            response_headers.append(("Cache-Control", "no-store"))
+
+        if status != 304:
+            if body or status == 200:
+                response_headers.append(("Content-Type", "application/json"))
+            response_headers.append(("Content-Length", str(len(body))))
+        response_headers.append(("Connection", "keep-alive" if keep_alive else "close"))
+
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"] + [f"{name}: {value}" for name, value in response_headers]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1'))
+        if method != "HEAD" and status != 304:
+            writer.write(body)
+        await writer.drain()
+
+def start_api_server(scheduler, host=None, port=None):
+    """Serve the jobs API and the /sync trigger; returns None when API_PORT is 0"""
+    default_host, default_port = get_api_address()
+    host = host or default_host
+    port = int(port if port is not None else default_port)
+    if not port:
+        return None
+    server = ApiServer(scheduler, host, port).start()
+    logging.info(f"API listening on http://{host}:{server.port} (/jobs, /jobs/{{id}}, /sync)")
+    return server
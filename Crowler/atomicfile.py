@@ -0,0 +1,27 @@
+import os
+import tempfile
+import metrics
+
+def write_atomic(path, data, encoding='utf-8'):
+    """Write to a temporary file next to path and rename it into place
+
+    Readers see either the old or the new file, never a half-written one.
+    """
+    payload = data if isinstance(data, bytes) else data.encode(encoding)
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; published files must stay readable by the web server
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+        metrics.current.inc("bytes_written_total", len(payload))
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Offline crawl and upload benchmark.
+
+Serves a recorded or synthetic board from fixtureserver.py and runs sync_jobs once
+per engine and concurrency setting, each in a fresh process and working directory.
+It reports wall time, jobs/sec and peak RSS (Python plus browsers). With --ftp each
+run also uploads to a local FTP server (needs pyftpdlib).
+
+Usage:
+  python3 benchmark.py --jobs 2000 --latency 0.1
+  python3 benchmark.py --snapshots snapshots --engines http,selenium --concurrency 1,4,8 --ftp
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+from fixtureserver import FixtureServer, DEFAULT_PAGE_SIZE
+from driverpool import process_tree_rss_mb
+
+RESULT_FILE = "benchmark-run.json"
+
+FTP_USER = "benchmark"
+FTP_PASSWORD = "benchmark"
+
+class PeakRssSampler:
+    """Poll the resident memory of this process and its browsers from a background thread"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self.stopped.is_set():
+            self.peak_mb = max(self.peak_mb, process_tree_rss_mb(os.getpid()))
+            self.stopped.wait(self.interval)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+        self.peak_mb = max(self.peak_mb, process_tree_rss_mb(os.getpid()))
+
+def start_ftp_server(root):
+    """Start a local FTP server on a free port; returns (server, port)"""
+    try:
+        from pyftpdlib.authorizers import DummyAuthorizer
+        from pyftpdlib.handlers import FTPHandler
+        from pyftpdlib.servers import FTPServer
+    except ImportError:
+        raise SystemExit("The upload benchmark needs pyftpdlib: pip install pyftpdlib")
+
+    # pyftpdlib logs every session at INFO unless its logger is already configured
+    logging.getLogger("pyftpdlib").addHandler(logging.NullHandler())
+    logging.getLogger("pyftpdlib").setLevel(logging.WARNING)
+    authorizer = DummyAuthorizer()
+    authorizer.add_user(FTP_USER, FTP_PASSWORD, root, perm="elradfmwMT")
+    handler = type("BenchmarkFTPHandler", (FTPHandler,), {"authorizer": authorizer})
+    server = FTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, kwargs={"handle_exit": False}, daemon=True).start()
+    return server, server.socket.getsockname()[1]
+
+def run_one(workdir, upload):
+    """Child process: one sync (and upload) in workdir, results written to RESULT_FILE"""
+    os.chdir(workdir)
+    # Imported here so module loading is not part of the parent's measurements
+    import metrics
+    from boards import get_boards
+    from crowler import sync_jobs
+
+    run = metrics.start_run()
+    result = {}
+    with PeakRssSampler() as sampler:
+        start = time.perf_counter()
+        with run.span("sync"):
+            errors = sync_jobs()
+        result["syncSeconds"] = time.perf_counter() - start
+
+        if upload:
+            from ftptransfer import upload_jobs_to_ftp
+            start = time.perf_counter()
+            with run.span("upload"):
+                upload_jobs_to_ftp()
+            result["uploadSeconds"] = time.perf_counter() - start
+    metrics.write_run_reports(run)
+
+    jobs = 0
+    for board in get_boards():
+        with open(os.path.join(board["outDir"], 'jobs.json'), 'r', encoding='utf-8') as f:
+            jobs += len(json.load(f)["jobs"])
+    counters = run.to_summary()["counters"]
+    result.update({
+        "jobs": jobs,
+        "errors": len(errors),
+        "jobsPerSecond": jobs / result["syncSeconds"] if result["syncSeconds"] else 0,
+        "peakRssMb": sampler.peak_mb,
+        # ru_maxrss is in KB on Linux
+        "pythonPeakRssMb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "pagesFetched": sum(counters.get("pages_fetched_total", {}).values()),
+        "webdriverCommands": sum(counters.get("webdriver_commands_total", {}).values()),
+    })
+    with open(RESULT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+def run_benchmarks(server, engines, concurrencies, ftp_root=None, ftp_port=None, keep=False, boards=None) -> list:
+    results = []
+    for engine in engines:
+        for concurrency in concurrencies:
+            name = f"{engine}-c{concurrency}"
+            workdir = tempfile.mkdtemp(prefix=f"crowler-bench-{name}-")
+            env = dict(
+                os.environ,
+                JOBVITE_BASE_URL=server.base_url,
+                CRAWL_ENGINE=engine,
+                CRAWL_CONCURRENCY=str(concurrency),
+                CRAWL_HOST_CONNECTIONS=str(concurrency),
+                BROWSER_POOL_SIZE=str(concurrency),
+                BROWSER_KEEP_WARM="false",
+                # Every run starts cold so the numbers are comparable
+                SYNC_MODE="full",
+                # The fixture server is local, so only an explicit rate limit applies
+                CRAWL_HOST_RATE=os.environ.get("CRAWL_HOST_RATE", "0"),
+                METRICS_DIR=os.path.join(workdir, "metrics"),
+                DATA_DIR="",
+            )
+            if boards:
+                env["JOBVITE_BOARDS"] = boards
+            args = [sys.executable, os.path.abspath(__file__), "--run-one", workdir]
+            if ftp_root:
+                os.makedirs(os.path.join(ftp_root, name))
+                env.update(FTP_HOST="127.0.0.1", FTP_PORT=str(ftp_port), FTP_USERNAME=FTP_USER,
+                           FTP_PASSWORD=FTP_PASSWORD, FTP_DIRECTORY=f"/{name}")
+                args.append("--upload")
+
+            print(f"Running {name}...")
+            requests_before = server.requests_served
+            start = time.perf_counter()
+            completed = subprocess.run(args, env=env, capture_output=True, text=True)
+            result = {"engine": engine, "concurrency": concurrency,
+                      "wallSeconds": time.perf_counter() - start,
+                      "requests": server.requests_served - requests_before}
+            try:
+                with open(os.path.join(workdir, RESULT_FILE), 'r', encoding='utf-8') as f:
+                    result.update(json.load(f))
+            except (OSError, ValueError):
+                result["failed"] = True
+                print(f"  {name} failed (exit code {completed.returncode}):")
+                print("  " + "\n  ".join((completed.stdout + completed.stderr).strip().splitlines()[-15:]))
+            results.append(result)
+
+            if keep:
+                print(f"  Output kept in {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def print_results(results):
+    header = f"{'engine':<10}{'conc':>5}{'jobs':>7}{'errors':>7}{'sync s':>9}{'jobs/s':>9}" \
+             f"{'upload s':>10}{'peak MB':>9}{'py MB':>8}{'wall s':>9}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        if result.get("failed"):
+            print(f"{result['engine']:<10}{result['concurrency']:>5}  failed")
+            continue
+        upload = f"{result['uploadSeconds']:.2f}" if "uploadSeconds" in result else "-"
+        print(f"{result['engine']:<10}{result['concurrency']:>5}{result['jobs']:>7}{result['errors']:>7}"
+              f"{result['syncSeconds']:>9.2f}{result['jobsPerSecond']:>9.1f}{upload:>10}"
+              f"{result['peakRssMb']:>9.0f}{result['pythonPeakRssMb']:>8.0f}{result['wallSeconds']:>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crawler against a local fixture server")
+    parser.add_argument("--snapshots", help="Directory written by recorder.py")
+    parser.add_argument("--jobs", type=int, default=0, help="Synthetic board size (default: replay snapshots)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Postings per list page")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the fixture server waits per page")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to this many seconds")
+    parser.add_argument("--engines", default="http", help="Comma-separated engines: http,selenium")
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated CRAWL_CONCURRENCY values")
+    parser.add_argument("--boards", help="Comma-separated company slugs crawled together (synthetic boards only)")
+    parser.add_argument("--ftp", action="store_true", help="Also time the upload to a local FTP server")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the results")
+    parser.add_argument("--keep", action="store_true", help="Keep each run's working directory")
+    parser.add_argument("--run-one", metavar="WORKDIR", help=argparse.SUPPRESS)
+    parser.add_argument("--upload", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        run_one(args.run_one, args.upload)
+        return
+
+    if not args.snapshots and not args.jobs:
+        parser.error("pass --snapshots, --jobs or both")
+
+    server = FixtureServer(args.snapshots, args.jobs, args.page_size, args.latency, args.jitter).start()
+    ftp_server = ftp_root = ftp_port = None
+    if args.ftp:
+        ftp_root = tempfile.mkdtemp(prefix="crowler-bench-ftp-")
+        ftp_server, ftp_port = start_ftp_server(ftp_root)
+    print(f"Fixture server at {server.base_url}" + (f", FTP server on port {ftp_port}" if ftp_server else ""))
+
+    try:
+        results = run_benchmarks(
+            server,
+            [engine.strip() for engine in args.engines.split(",") if engine.strip()],
+            [int(value) for value in args.concurrency.split(",") if value.strip()],
+            ftp_root, ftp_port, args.keep, args.boards,
+        )
+    finally:
+        server.close()
+        if ftp_server:
+            ftp_server.close_all()
+            shutil.rmtree(ftp_root, ignore_errors=True)
+
+    print()
+    print_results(results)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            "board": {"snapshots": args.snapshots, "jobs": args.jobs, "boards": args.boards, "pageSize": args.page_size,
+                      "latency": args.latency, "jitter": args.jitter},
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
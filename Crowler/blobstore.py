@@ -0,0 +1,128 @@
+import os
+import re
+import hashlib
+import unicodedata
+from atomicfile import write_atomic
+from htmlsanitizer import VOID_ELEMENTS
+import metrics
+
+# Content-addressed description fragments, named {hash}.html, next to jobs.json
+BLOBS_DIR = "blobs"
+
+# Hex digits of the sha256 kept in a blob name
+HASH_LENGTH = 20
+
+BLOB_NAME = re.compile(rf"^[0-9a-f]{{{HASH_LENGTH}}}\.html$")
+
+# Sections smaller than this are merged into their neighbour rather than stored on their own,
+# so a description is a handful of requests at most
+MIN_FRAGMENT_BYTES = 512
+
+# Sanitized markup is well-formed and escapes '<' in text and attributes, so tags can be matched directly
+TAG = re.compile(r"<(/?)([a-z0-9]+)[^>]*>")
+
+# A top-level block that starts a new section: a real heading or a paragraph that is only bold text
+SECTION_HEADING = re.compile(r"^(?:<h[2-4]>|<p><(b|strong)>(?:(?!<).)*</\1></p>$)")
+
+def normalize(html) -> str:
+    return unicodedata.normalize("NFC", html.strip())
+
+def content_hash(html) -> str:
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+
+def top_level_blocks(html) -> list:
+    """Split markup into its top-level elements (text between them sticks to the next one)"""
+    blocks = []
+    depth = 0
+    start = 0
+    for match in TAG.finditer(html):
+        closing, tag = match.groups()
+        if tag in VOID_ELEMENTS:
+            continue
+        depth += -1 if closing else 1
+        if depth == 0:
+            blocks.append(html[start:match.end()])
+            start = match.end()
+    if start < len(html):
+        blocks.append(html[start:])
+    return blocks
+
+def split_sections(html) -> list:
+    """Cut a description before each section heading
+
+    Boilerplate such as 'About us' or 'Benefits' is copied verbatim into every posting,
+    so its sections hash the same everywhere and are stored once.
+    """
+    sections = []
+    for block in top_level_blocks(html):
+        if not sections or SECTION_HEADING.match(block):
+            sections.append(block)
+        else:
+            sections[-1] += block
+
+    # Small sections ride along with the next one (the last one with the one before)
+    merged = []
+    pending = ""
+    for section in sections:
+        pending += section
+        if len(pending.encode('utf-8')) >= MIN_FRAGMENT_BYTES:
+            merged.append(pending)
+            pending = ""
+    if pending:
+        if merged:
+            merged[-1] += pending
+        else:
+            merged.append(pending)
+    return merged
+
+class BlobStore:
+    """Immutable description fragments, deduplicated by content hash
+
+    A job references its description as a list of fragment hashes; the page is their
+    concatenation. Blob names never change meaning, so they can be cached forever and
+    are only uploaded once, however many postings share them.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, blob_hash) -> str:
+        return os.path.join(self.root, f"{blob_hash}.html")
+
+    def has(self, blob_hash) -> bool:
+        return os.path.exists(self.path(blob_hash))
+
+    def put(self, html) -> list:
+        """Store a description and return its fragment hashes ([] when it is empty)"""
+        html = normalize(html)
+        if not html:
+            return []
+        hashes = []
+        for fragment in split_sections(html):
+            blob_hash = content_hash(fragment)
+            if self.has(blob_hash):
+                metrics.current.inc("description_blobs_total", status="reused")
+            else:
+                write_atomic(self.path(blob_hash), fragment)
+                metrics.current.inc("description_blobs_total", status="written")
+            hashes.append(blob_hash)
+        return hashes
+
+    def get(self, hashes) -> str:
+        parts = []
+        for blob_hash in hashes:
+            with open(self.path(blob_hash), 'r', encoding='utf-8') as f:
+                parts.append(f.read())
+        return "".join(parts)
+
+    def collect_garbage(self, referenced) -> int:
+        """Delete blobs no job references any more; returns how many were removed"""
+        removed = 0
+        for file in os.listdir(self.root):
+            if BLOB_NAME.match(file) and file[:-len(".html")] not in referenced:
+                os.remove(os.path.join(self.root, file))
+                removed += 1
+        if removed:
+            print(f"Removed {removed} unreferenced description blobs")
+        return removed
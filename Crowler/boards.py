@@ -0,0 +1,38 @@
+import os
+from urllib.parse import urljoin, urlparse
+from httpcrawler import get_base_url
+
+# Multi-board output lives under boards/{slug}/, mirrored on the FTP server
+BOARDS_DIR = "boards"
+
+def get_data_dir() -> str:
+    """Local root of every board's output, jobs.db and crawl journal (DATA_DIR, default: working directory)"""
+    return os.getenv('DATA_DIR', '')
+
+def board_slug(base_url) -> str:
+    return urlparse(base_url).path.rstrip("/").split("/")[-1]
+
+def get_boards() -> list:
+    """Boards to crawl, each with its URL, local output directory and FTP path
+
+    Without JOBVITE_BOARDS the single board at JOBVITE_BASE_URL keeps the flat
+    layout (jobs.json and jobs/ in DATA_DIR, at the root of the FTP directory). With
+    a comma-separated list of company slugs, every board is namespaced under
+    boards/{slug}/ in both places.
+    """
+    base_url = get_base_url()
+    data_dir = get_data_dir()
+    slugs = [slug.strip() for slug in os.getenv('JOBVITE_BOARDS', '').split(',') if slug.strip()]
+    if not slugs:
+        return [{"slug": board_slug(base_url), "baseUrl": base_url, "outDir": data_dir, "remoteDir": ""}]
+
+    return [
+        {
+            "slug": slug,
+            # Sibling of the configured board on the same host
+            "baseUrl": urljoin(base_url, f"../{slug}/"),
+            "outDir": os.path.join(data_dir, BOARDS_DIR, slug),
+            "remoteDir": f"{BOARDS_DIR}/{slug}",
+        }
+        for slug in dict.fromkeys(slugs)
+    ]
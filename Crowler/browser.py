@@ -0,0 +1,215 @@
+"""
+Drive headless Chromium through a Jobvite board: the Selenium engine and its fallback.
+
+Only crowler.py's browser code paths import this module, so HTTP and offline crawls
+never load Selenium.
+"""
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import shutil
+import tempfile
+from urllib.parse import urljoin
+from jobparser import MarkupError, jobvite_id_from_href, parse_meta_text, clean_description
+from httpcrawler import get_base_url
+from ratelimit import get_rate_limiter
+import metrics
+
+# Each script returns a whole page's data in a single WebDriver round trip
+LIST_PAGE_SCRIPT = """
+return {
+    rows: Array.from(document.getElementsByClassName('jv-job-list-name')).map(function (el) {
+        var link = el.querySelector('a');
+        // textContent, not innerText: stylesheets are blocked, so layout text is unreliable
+        return {href: link ? link.href : null, text: el.textContent.replace(/\\s+/g, ' ').trim()};
+    }),
+    showMore: Array.from(document.getElementsByTagName('a')).filter(function (a) {
+        return a.textContent.indexOf('Show More') !== -1 && a.href;
+    }).map(function (a) { return a.href; })
+};
+"""
+
+DETAIL_PAGE_SCRIPT = """
+var description = document.querySelector('.jv-job-detail-description');
+var meta = document.querySelector('.jv-job-detail-meta');
+return {
+    description: description ? description.innerHTML : null,
+    meta: meta ? meta.innerHTML : ''
+};
+"""
+
+# The scraper only reads markup, so images, fonts and stylesheets are never downloaded
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css",
+]
+
+class CountingChrome(webdriver.Chrome):
+    """Chrome driver that counts WebDriver commands (HTTP round trips to chromedriver)"""
+
+    command_count = 0
+    profile_dir = None
+
+    def execute(self, driver_command, params=None):
+        self.command_count += 1
+        return super().execute(driver_command, params)
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            if self.profile_dir:
+                shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+def get_driver():
+    options = webdriver.ChromeOptions()
+    
+    # Every browser gets its own throwaway profile, removed again on quit()
+    profile_dir = tempfile.mkdtemp(prefix="crowler-chrome-")
+
+    # Add necessary options for server environment
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-plugins")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-web-security")
+    options.add_argument("--allow-running-insecure-content")
+
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+    })
+    
+    # Return from driver.get at DOMContentLoaded; the waits below handle the rest
+    options.page_load_strategy = "eager"
+
+    # For Docker environment, use system chromium
+    options.binary_location = "/usr/bin/chromium"
+
+    try:
+        with metrics.current.span("driver_startup"):
+            driver = CountingChrome(options=options)
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    driver.profile_dir = profile_dir
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+def read_list_page(driver):
+    """Read every job row and 'Show More' href on the current page in one script call"""
+    page = driver.execute_script(LIST_PAGE_SCRIPT)
+    jobs = [
+        {"jobviteId": jobvite_id_from_href(row["href"]), "jobTitle": row["text"]}
+        for row in page["rows"]
+        if row["href"] and row["text"]  # Only add non-empty titles
+    ]
+    return jobs, page["showMore"]
+
+def navigate(driver, url):
+    """driver.get under the per-host rate limit shared with the HTTP engine"""
+    get_rate_limiter().acquire(url)
+    driver.get(url)
+
+def load_job_list_page(driver, url):
+    """Navigate to a list page and wait until its job rows (if any) are rendered"""
+    navigate(driver, url)
+    wait = WebDriverWait(driver, 10)
+    wait.until(lambda d: d.execute_script("return document.readyState") != "loading")
+    try:
+        wait.until(EC.presence_of_element_located((By.CLASS_NAME, "jv-job-list-name")))
+    except TimeoutException:
+        pass  # A page without job rows simply adds nothing
+
+def get_jobs(driver, base_url=None):
+    navigate(driver, base_url or get_base_url())
+    
+    # Wait for the page to load and elements to be present
+    wait = WebDriverWait(driver, 10)
+    
+    try:
+        # Wait for job list elements to be present
+        wait.until(EC.presence_of_element_located((By.CLASS_NAME, "jv-job-list-name")))
+        
+        job_titles, show_more_hrefs = read_list_page(driver)
+        print(f"Found {len(job_titles)} jobs on initial page")
+        
+        # Get additional jobs from "Show More" links, skipping ones already listed
+        existing_ids = {job["jobviteId"] for job in job_titles}
+        new_jobs = get_show_more_jobs(driver, show_more_hrefs, existing_ids)
+        print(f"Found {len(new_jobs)} additional jobs from Show More links")
+        job_titles.extend(new_jobs)
+        
+        print(f"Total unique jobs: {len(job_titles)}")
+        return job_titles
+        
+    except Exception as e:
+        print(f"Error occurred: {e}")
+        return []
+        
+def get_show_more_jobs(driver, show_more_hrefs, known_ids=()):
+    """Load every 'Show More' page directly, following pagination until no new jobs appear"""
+    known_ids = set(known_ids)
+    new_jobs = []
+    
+    # Hrefs are plain strings read up front: elements go stale once the driver navigates
+    pending = list(show_more_hrefs)
+    visited = set()
+    print(f"Found {len(pending)} Show More links")
+    
+    while pending:
+        href = pending.pop(0)
+        if href in visited:
+            continue
+        visited.add(href)
+        
+        try:
+            print(f"Loading Show More link {len(visited)}: {href}")
+            load_job_list_page(driver, href)
+            
+            page_jobs, page_hrefs = read_list_page(driver)
+            page_jobs = [job for job in page_jobs if job["jobviteId"] not in known_ids]
+            print(f"Found {len(page_jobs)} new jobs on page")
+            
+            # Only a page that still yields new jobs is worth paginating further
+            if page_jobs:
+                new_jobs.extend(page_jobs)
+                known_ids.update(job["jobviteId"] for job in page_jobs)
+                pending.extend(page_hrefs)
+                
+        except Exception as e:
+            print(f"Error loading link {href}: {e}")
+    
+    return new_jobs
+
+def get_job_description(driver, jobvite_id, base_url=None) -> dict:
+    """Read a job's details in the browser; errors propagate so the job is reported as failed"""
+    navigate(driver, urljoin(base_url or get_base_url(), f"job/{jobvite_id}"))
+    
+    wait = WebDriverWait(driver, 10)
+    wait.until(EC.presence_of_element_located((By.CLASS_NAME, "jv-job-detail-description")))
+    
+    # Get description and meta information (sector, work mode, country) in one call
+    page = driver.execute_script(DETAIL_PAGE_SCRIPT)
+    if page["description"] is None:
+        raise MarkupError("no .jv-job-detail-description element found")
+    
+    job_description = clean_description(page["description"])
+    meta_info = parse_meta_text(page["meta"])
+    
+    return {
+        "description": job_description,
+        "sector": meta_info["sector"],
+        "work_mode": meta_info["work_mode"],
+        "country": meta_info["country"]
+    }
@@ -1,237 +1,317 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import time
-import json
+from collections import deque
 import os
-import subprocess
-from ftptransfer import upload_jobs_to_ftp
-from datetime import datetime
-
-def get_driver():
-    options = webdriver.ChromeOptions()
-
-    # Add necessary options for server environment
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--user-data-dir=/tmp/chrome-user-data")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-plugins")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-web-security")
-    options.add_argument("--allow-running-insecure-content")
-
-    # For Docker environment, use system chromium
-    options.binary_location = "/usr/bin/chromium"
-
-    return webdriver.Chrome(options=options)
-
-def get_jobs(driver):
-    driver.get("https://jobs.jobvite.com/leantechio/")
-    
-    # Wait for the page to load and elements to be present
-    wait = WebDriverWait(driver, 10)
-    
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from jobparser import MarkupError
+from httpcrawler import get_session, get_jobs_http, get_job_description_http
+from driverpool import DriverPool
+from memorywatch import get_memory_watchdog
+from boards import get_boards
+from journal import CrawlJournal, JOURNAL_FILE
+from blobstore import BlobStore, BLOBS_DIR
+from jobstore import open_job_store
+import metrics
+from indexbuilder import export_jobs
+
+EMPTY_JOB_DETAILS = {
+    "description": "",
+    "sector": "",
+    "work_mode": "",
+    "country": ""
+}
+
+_driver_pool = None
+
+def _start_browser():
+    # Selenium is only loaded once a browser is actually needed
+    from browser import get_driver
+    return get_driver()
+
+def get_driver_pool():
+    """Return the process-wide browser pool, kept warm between scheduled runs"""
+    global _driver_pool
+    if _driver_pool is None:
+        _driver_pool = DriverPool(
+            _start_browser,
+            size=int(os.getenv('BROWSER_POOL_SIZE', '1')),
+            max_pages=int(os.getenv('BROWSER_MAX_PAGES', '200')),
+            max_rss_mb=int(os.getenv('BROWSER_MAX_RSS_MB', '0')),
+        )
+        atexit.register(_driver_pool.close)
+    return _driver_pool
+
+def crawl_job_list(engine, session, pool, base_url=None):
+    """Get the job list with the configured engine, using Selenium as fallback"""
+    if engine == "offline":
+        return get_jobs_http(session, base_url)  # Replayed snapshots: no browser to fall back to
+    if engine == "http":
+        try:
+            return get_jobs_http(session, base_url)
+        except MarkupError as e:
+            print(f"Could not parse job list over HTTP ({e}), falling back to Selenium")
+            metrics.current.inc("selenium_fallbacks_total", page="list")
+    from browser import get_jobs
+    with pool.driver() as driver:
+        return get_jobs(driver, base_url)
+
+def crawl_job_details(engine, session, pool, jobvite_id, base_url=None) -> dict:
+    """Get a job's details with the configured engine, using Selenium as fallback"""
+    if engine == "offline":
+        return get_job_description_http(session, jobvite_id, base_url)
+    if engine == "http":
+        try:
+            return get_job_description_http(session, jobvite_id, base_url)
+        except MarkupError as e:
+            print(f"Could not parse job {jobvite_id} over HTTP ({e}), falling back to Selenium")
+            metrics.current.inc("selenium_fallbacks_total", page="detail")
+    from browser import get_job_description
+    with pool.driver() as driver, metrics.current.timer("page_latency_seconds", engine="selenium"):
+        metrics.current.inc("pages_fetched_total", engine="selenium")
+        return get_job_description(driver, jobvite_id, base_url)
+
+def fetch_job_details(engine, session, pool, jobvite_id, base_url=None):
+    """Worker task: return (details, error) so one failed job never stops the run"""
     try:
-        # Wait for job list elements to be present
-        wait.until(EC.presence_of_element_located((By.CLASS_NAME, "jv-job-list-name")))
-        
-        # Find all elements with the class jv-job-list-name
-        job_elements = driver.find_elements(By.CLASS_NAME, "jv-job-list-name")
-        
-        # Extract text content from all job elements
-        job_titles = []
-        for element in job_elements:
-            link = element.find_element(By.TAG_NAME, "a")
-            link_href = link.get_attribute("href")
-            jobvite_id = link_href.split("/")[-1]
-            job_title = element.text.strip()
-            if job_title:  # Only add non-empty titles
-                job_titles.append({"jobviteId": jobvite_id, "jobTitle": job_title})
-        
-        print(f"Found {len(job_titles)} jobs on initial page")
-        
-        # Get additional jobs from "Show More" links
-        new_jobs = get_show_more_jobs(driver)
-        print(f"Found {len(new_jobs)} additional jobs from Show More links")
-        
-        # Merge new jobs with existing ones, avoiding duplicates by jobviteId
-        existing_ids = {job["jobviteId"] for job in job_titles}
-        for new_job in new_jobs:
-            if new_job["jobviteId"] not in existing_ids:
-                job_titles.append(new_job)
-                existing_ids.add(new_job["jobviteId"])
-        
-        print(f"Total unique jobs: {len(job_titles)}")
-        return job_titles
-        
+        return crawl_job_details(engine, session, pool, jobvite_id, base_url), None
     except Exception as e:
-        print(f"Error occurred: {e}")
-        return []
-        
-def get_show_more_jobs(driver):
-    """Find and click all 'Show More' links, collecting jobs from each new page"""
-    new_jobs = []
+        return dict(EMPTY_JOB_DETAILS), str(e)
+
+def crawl_all_job_details(engine, session, pool, jobs, executor, base_url=None, window=8):
+    """Fetch details for every job on a shared bounded pool, yielding results in list order
+
+    At most `window` fetches are queued or held at once, so finished descriptions are
+    streamed to the caller instead of piling up behind one slow page.
+    """
+    pending = deque()
+    remaining = iter(jobs)
+    for job in remaining:
+        pending.append((job, executor.submit(fetch_job_details, engine, session, pool, job["jobviteId"], base_url)))
+        if len(pending) >= window:
+            break
+    while pending:
+        job, future = pending.popleft()
+        job_details, error = future.result()
+        next_job = next(remaining, None)
+        if next_job is not None:
+            pending.append((next_job, executor.submit(
+                fetch_job_details, engine, session, pool, next_job["jobviteId"], base_url)))
+        yield job, job_details, error
     
-    # Find all links that contain "Show More" text
-    show_more_links = driver.find_elements(By.XPATH, "//a[contains(., 'Show More')]")
+def load_previous_jobs(out_dir="") -> dict:
+    """Return every job the board's store knows keyed by jobviteId, or {} when there is none"""
+    job_store = open_job_store(out_dir)
+    try:
+        jobs = job_store.load_jobs()
+    finally:
+        job_store.close()
+    if not jobs:
+        print("No previous jobs stored, running a full sync")
+    return jobs
+
+def is_cached(job, previous_job, store, ttl_seconds) -> bool:
+    """A job can skip its detail fetch if its title is unchanged and its description is fresh"""
+    if previous_job is None or previous_job.get("jobTitle") != job["jobTitle"]:
+        return False
+    hashes = previous_job.get("descriptionHashes")
+    fetched_at = previous_job.get("fetchedAt")
+    # A failed fetch leaves no description, so it is never fresh
+    if not hashes or not fetched_at or not all(store.has(blob_hash) for blob_hash in hashes):
+        return False
+    return time.time() - fetched_at < ttl_seconds
+
+def prune_job_files(jobs_dir, jobvite_ids):
+    """Delete shards of postings that are no longer listed"""
+    removed = 0
+    for file in os.listdir(jobs_dir):
+        jobvite_id, extension = os.path.splitext(file)
+        # Descriptions live in blobs/ now; any jobs/{id}.html is left over from before
+        if extension == '.html' or (extension == '.json' and jobvite_id not in jobvite_ids):
+            os.remove(os.path.join(jobs_dir, file))
+            print(f"Removed stale job file: {file}")
+            removed += 1
+    return removed
+
+def sync_jobs(engine=None, session=None, boards=None, incremental=None):
+    """Sync jobs from website and save to JSON file
+
+    The arguments override the environment; `python3 main.py crawl --offline` passes a
+    recorder.SnapshotSession with engine "offline" to rebuild a board from saved pages.
+    """
+    # "http" parses static markup over a pooled session, "selenium" drives Chromium
+    engine = engine or os.getenv('CRAWL_ENGINE', 'http')
+    # Detail pages fetched at once across all boards, and open connections allowed per host
+    concurrency = int(os.getenv('CRAWL_CONCURRENCY', '4'))
+    host_connections = int(os.getenv('CRAWL_HOST_CONNECTIONS', '4'))
+    # "incremental" only fetches new, retitled or expired postings; "full" fetches all
+    if incremental is None:
+        incremental = os.getenv('SYNC_MODE', 'incremental') == 'incremental'
+    ttl_seconds = float(os.getenv('DESCRIPTION_TTL_HOURS', '72')) * 3600
     
-    print(f"Found {len(show_more_links)} Show More links")
+    # Keep browsers alive for the next scheduled run instead of cold-starting Chromium
+    keep_warm = os.getenv('BROWSER_KEEP_WARM', 'true').lower() == 'true'
     
-    for i, link in enumerate(show_more_links):
-        try:
-            href = link.get_attribute("href")
-            print(f"Clicking Show More link {i+1}: {href}")
-            link.click()
-            time.sleep(2)  # Wait for page to load
-            
-            # After clicking, find all job elements on the new page
-            job_elements = driver.find_elements(By.CLASS_NAME, "jv-job-list-name")
-            print(f"Found {len(job_elements)} job elements on new page")
-            
-            # Extract job information from new page
-            for element in job_elements:
-                try:
-                    link_element = element.find_element(By.TAG_NAME, "a")
-                    link_href = link_element.get_attribute("href")
-                    jobvite_id = link_href.split("/")[-1]
-                    job_title = element.text.strip()
-                    if job_title:  # Only add non-empty titles
-                        new_jobs.append({"jobviteId": jobvite_id, "jobTitle": job_title})
-                except Exception as e:
-                    print(f"Error processing job element on new page: {e}")
-                    continue
-                    
-        except Exception as e:
-            print(f"Error clicking link {i+1}: {e}")
+    # Boards share one HTTP session, one browser pool and one detail-page executor
+    boards = boards or get_boards()
+    session = session or get_session(pool_size=host_connections)
+    pool = get_driver_pool()
+    commands_before = pool.command_count
+    # Detail results each board may hold before writing them out
+    window = max(1, concurrency) * 2
     
-    return new_jobs
-
-def get_job_meta_info(driver, jobvite_id) -> dict:
-    """Extract sector, work mode and country from job meta information"""
     try:
-        # Wait for meta element to be present
-        wait = WebDriverWait(driver, 5)
-        wait.until(EC.presence_of_element_located((By.CLASS_NAME, "jv-job-detail-meta")))
-        
-        meta_element = driver.find_element(By.CLASS_NAME, "jv-job-detail-meta")
-        meta_text = meta_element.get_attribute("innerHTML")
-        
-        # Parse the meta information
-        sector = ""
-        work_mode = ""
-        country = ""
-        
-        # Extract text content and split by separators
-        import re
-        # Remove HTML tags and get clean text
-        clean_text = re.sub(r'<[^>]+>', '|', meta_text)
-        clean_text = clean_text.replace('&amp;', '&')
-        
-        # Split by separators (| and ,)
-        parts = [part.strip() for part in re.split(r'[|,]', clean_text) if part.strip()]
-        
-        if len(parts) >= 1:
-            sector = parts[0]
-        if len(parts) >= 2:
-            work_mode = parts[1]
-        if len(parts) >= 3:
-            country = parts[2]
-        
-        return {
-            "sector": sector,
-            "work_mode": work_mode,
-            "country": country
-        }
-        
-    except Exception as e:
-        print(f"Error extracting meta info for job {jobvite_id}: {e}")
-        return {
-            "sector": "",
-            "work_mode": "",
-            "country": ""
-        }
+        # Samples Python plus browser memory, shedding browsers above MEMORY_BUDGET_MB
+        with get_memory_watchdog(pool), \
+                ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor, \
+                ThreadPoolExecutor(max_workers=len(boards)) as board_executor:
+            futures = [
+                board_executor.submit(_sync_board, board, engine, session, pool, executor, incremental,
+                                      ttl_seconds, window)
+                for board in boards
+            ]
+            return _collect_board_errors(boards, futures)
+    finally:
+        commands = pool.command_count - commands_before
+        metrics.current.inc("webdriver_commands_total", commands)
+        print(f"WebDriver commands issued: {commands}")
+        if not keep_warm:
+            pool.close()
+        session.clear()
 
-def get_job_description(driver, jobvite_id) -> dict:
-    driver.get(f"https://jobs.jobvite.com/leantechio/job/{jobvite_id}")
+def _collect_board_errors(boards, futures):
+    """Wait for every board; one failed board does not stop the others from being written"""
+    errors = []
+    failed = []
+    for board, future in zip(boards, futures):
+        try:
+            errors.extend(future.result())
+        except Exception as e:
+            print(f"Error syncing board {board['slug']}: {e}")
+            metrics.current.error("board", str(e), board=board["slug"])
+            failed.append(f"{board['slug']}: {e}")
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(boards)} boards failed: {'; '.join(failed)}")
+    return errors
+
+def _sync_board(board, engine, session, pool, executor, incremental, ttl_seconds, window):
+    out_dir = board["outDir"]
+    base_url = board["baseUrl"]
+    print(f"Syncing board {board['slug']} from {base_url}")
+    
+    # Create jobs directory if it doesn't exist
+    jobs_dir = os.path.join(out_dir, "jobs")
+    os.makedirs(jobs_dir, exist_ok=True)
+    
+    store = BlobStore(os.path.join(out_dir, BLOBS_DIR))
+    # Loaded in full mode too: a failed fetch falls back to the last good copy
+    previous_jobs = load_previous_jobs(out_dir)
     
-    wait = WebDriverWait(driver, 10)
+    # Jobs an interrupted run already finished count as fresh cache entries, even in full mode
+    journal = CrawlJournal(os.path.join(out_dir, JOURNAL_FILE))
+    resumed = journal.resume(ttl_seconds)
+    if resumed:
+        print(f"Resuming interrupted run: {len(resumed)} jobs already done")
+        metrics.current.inc("jobs_resumed_total", len(resumed), board=board["slug"])
+        previous_jobs.update(resumed)
+    reusable_jobs = previous_jobs if incremental else resumed
+    
+    with metrics.current.span("job_list"):
+        jobs = crawl_job_list(engine, session, pool, base_url)
+    errors = []
+    journal.start(resuming=bool(resumed))
+    
+    cached_ids = {
+        job["jobviteId"] for job in jobs
+        if is_cached(job, reusable_jobs.get(job["jobviteId"]), store, ttl_seconds)
+    }
+    stale_jobs = [job for job in jobs if job["jobviteId"] not in cached_ids]
+    print(f"{len(cached_ids)} unchanged jobs reused, {len(stale_jobs)} jobs to fetch")
+    metrics.current.inc("jobs_total", len(cached_ids), board=board["slug"], status="cached")
+    
+    # Results arrive in the order of stale_jobs, which follows the order of jobs
+    fetched = crawl_all_job_details(engine, session, pool, stale_jobs, executor, base_url, window)
     
     try:
-        wait.until(EC.presence_of_element_located((By.CLASS_NAME, "jv-job-detail-description")))
-        
-        # Get job description
-        job_description = driver.find_element(By.CLASS_NAME, "jv-job-detail-description").get_attribute("innerHTML")
-        job_description = job_description.replace("background-color: rgb(255,255,255);", "none")
-        job_description = job_description.replace("\n", "")
-        
-        # Get meta information (sector, work mode, country)
-        meta_info = get_job_meta_info(driver, jobvite_id)
+        with metrics.current.span("job_details"):
+            _update_job_details(board, jobs, cached_ids, previous_jobs, fetched, store, errors, journal)
+        jobs = journal.compact(jobs, {jobvite_id: previous_jobs[jobvite_id] for jobvite_id in cached_ids})
+    finally:
+        journal.close()
         
-        return {
-            "description": job_description,
-            "sector": meta_info["sector"],
-            "work_mode": meta_info["work_mode"],
-            "country": meta_info["country"]
-        }
-        
-    except Exception as e:
-        print(f"Error occurred: {e}")
-        return {
-            "description": "",
-            "sector": "",
-            "work_mode": "",
-            "country": ""
-        }
-    
-def sync_jobs():
-    """Sync jobs from website and save to JSON file"""
-    driver = get_driver()
+    # The store applies the listing as a diff; jobs.json and the rest are exported from it
+    job_store = open_job_store(out_dir)
+    try:
+        with metrics.current.span("write_index"):
+            changes, changed_ids = job_store.record_sync(jobs)
+            jobs = job_store.open_jobs()
+            print(", ".join(f"{count} {change}" for change, count in changes.items()))
+            for change, count in changes.items():
+                metrics.current.inc("job_changes_total", count, board=board["slug"], change=change)
+            
+            export_jobs(out_dir, jobs, store, job_store.last_synced(), changed_ids)
+    finally:
+        job_store.close()
+    journal.finish()
     
-    # Create jobs directory if it doesn't exist
-    jobs_dir = "jobs"
-    os.makedirs(jobs_dir, exist_ok=True)
+    # An empty list usually means the list page failed, so keep the files
+    if jobs:
+        prune_job_files(jobs_dir, {job["jobviteId"] for job in jobs})
+        store.collect_garbage({blob_hash for job in jobs for blob_hash in job["descriptionHashes"]})
     
-    jobs = get_jobs(driver)
+    if errors:
+        print(f"{len(errors)} of {len(jobs)} jobs failed on board {board['slug']}:")
+        for error in errors:
+            print(f"  {error['jobviteId']}: {error['error']}")
     
-    # Update job descriptions and meta information
+    return errors
+
+def _update_job_details(board, jobs, cached_ids, previous_jobs, fetched, store, errors, journal):
+    # Save job descriptions and journal each job's meta information as soon as it is done
     for job in jobs:
         jobvite_id = job["jobviteId"]
+        previous_job = previous_jobs.get(jobvite_id)
         
-        filename = f"{jobvite_id}.html"
+        # Already in the job store (or the resumed journal), so no checkpoint or fsync needed
+        if jobvite_id in cached_ids:
+            continue
         
+        _, job_details, error = next(fetched)
+        metrics.current.inc("jobs_total", board=board["slug"], status="failed" if error else "fetched")
         print(f"Processing {jobvite_id}: {job['jobTitle']}")
-        job_details = get_job_description(driver, jobvite_id)
+        if error:
+            errors.append({"board": board["slug"], "jobviteId": jobvite_id, "error": error})
+            metrics.current.error("job_details", error, board=board["slug"], jobviteId=jobvite_id)
+            print(f"  Error: {error}")
+            if previous_job is not None and previous_job.get("descriptionHashes"):
+                # Keep serving the last good copy rather than an empty description
+                journal.record(job, previous_job, "failed", error)
+                continue
         
-        # Save job description to separate HTML file
-        html_file_path = os.path.join(jobs_dir, f"{jobvite_id}.html")
-        with open(html_file_path, 'w', encoding='utf-8') as html_file:
-            html_file.write(job_details["description"])
-        print(f"  Saved description to: {html_file_path}")
+        # Save the description as content-addressed fragments, shared with other postings
+        hashes = store.put(job_details["description"])
+        print(f"  Saved description as: {', '.join(hashes) or '(empty)'}")
         
         # Add all the extracted information in camelCase
-        job["sector"] = job_details["sector"]
-        job["workMode"] = job_details["work_mode"]
-        job["country"] = job_details["country"]
-        
-        print(f"  Sector: {job['sector']}")
-        print(f"  Work Mode: {job['workMode']}")
-        print(f"  Country: {job['country']}")
+        meta = {
+            "sector": job_details["sector"],
+            "workMode": job_details["work_mode"],
+            "country": job_details["country"],
+            "descriptionHashes": hashes,
+            # Failed fetches are never fresh, so the next run tries again
+            "fetchedAt": None if error else int(time.time())
+        }
+        journal.record(job, meta, "failed" if error else "fetched", error)
         
-    json_content = {
-        "jobs": jobs,
-        "lastUpdated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    # Save updated jobs
-    with open('jobs.json', 'w', encoding='utf-8') as f:
-        json.dump(json_content, f, indent=2, ensure_ascii=False)
-    
-    driver.quit()
+        print(f"  Sector: {meta['sector']}")
+        print(f"  Work Mode: {meta['workMode']}")
+        print(f"  Country: {meta['country']}")
     
 if __name__ == "__main__":
-    sync_jobs()
-    #upload_jobs_to_ftp()
\ No newline at end of file
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    try:
+        with metrics.start_run().span("sync"):
+            sync_jobs()
+    finally:
+        metrics.write_run_reports()
@@ -1,32 +1,27 @@
 import os
-from ftplib import FTP
 from dotenv import load_dotenv
+from ftppool import FtpUploader, get_ftp_config, print_upload_report
+from boards import get_data_dir
+from blobstore import BLOBS_DIR
 
 # Load environment variables from .env file
 load_dotenv()
 
 def upload_service_files():
-    # Get FTP credentials from environment variables
-    ftp_host = os.getenv('FTP_HOST')
-    ftp_username = os.getenv('FTP_USERNAME')
-    ftp_password = os.getenv('FTP_PASSWORD')
-    ftp_directory = os.getenv('FTP_DIRECTORY')
+    config = get_ftp_config()
     
-    # Validate that all required environment variables are set
-    if not all([ftp_host, ftp_username, ftp_password, ftp_directory]):
-        raise ValueError("Missing required FTP environment variables. Please check your .env file.")
-    
-    ftp = FTP(ftp_host)
-    ftp.login(ftp_username, ftp_password)
-    ftp.cwd(ftp_directory) 
-    
-    # Define the source directories
-    source_dirs = ["../Site/dist", "jobs"]
+    # Define the source directories and where they go on the server
+    data_dir = get_data_dir()
+    source_dirs = {
+        "../Site/dist": "",
+        os.path.join(data_dir, "jobs"): "jobs",
+        os.path.join(data_dir, BLOBS_DIR): BLOBS_DIR,
+    }
     
     # Get all files from the source directories recursively
     files_to_upload = []
     
-    for source_dir in source_dirs:
+    for source_dir, remote_dir in source_dirs.items():
         if not os.path.exists(source_dir):
             print(f"Warning: Source directory {source_dir} does not exist")
             continue
@@ -36,34 +31,27 @@ def upload_service_files():
             for file in files:
                 file_path = os.path.join(root, file)
                 # Calculate relative path from source_dir
-                relative_path = os.path.relpath(file_path, source_dir)
+                relative_path = os.path.relpath(file_path, source_dir).replace(os.sep, "/")
                 # Add directory name prefix to avoid conflicts
-                if source_dir == "jobs":
-                    relative_path = f"jobs/{relative_path}"
+                if remote_dir:
+                    relative_path = f"{remote_dir}/{relative_path}"
                 files_to_upload.append((file_path, relative_path))
     
-    # Upload each file
-    uploaded_count = 0
-    for local_path, remote_path in files_to_upload:
-        try:
-            # Create directory structure on FTP server if needed
-            remote_dir = os.path.dirname(remote_path)
-            if remote_dir and remote_dir != '.':
-                try:
-                    ftp.mkd(remote_dir)
-                except:
-                    pass  # Directory might already exist
-            
-            # Upload file
-            with open(local_path, 'rb') as file:
-                ftp.storbinary(f'STOR {remote_path}', file)
-            print(f"Uploaded: {remote_path}")
-            uploaded_count += 1
-            
-        except Exception as e:
-            print(f"Error uploading {remote_path}: {e}")
+    # Entry points go last, so they never reference assets that are not uploaded yet
+    entry_points = {"index.html", "jobs.json"}
+    assets = [pair for pair in files_to_upload if pair[1] not in entry_points]
+    entries = [pair for pair in files_to_upload if pair[1] in entry_points]
+    
+    # Upload over a pool of connections; each remote directory is created once
+    uploader = FtpUploader(config)
+    try:
+        results = uploader.upload(assets)
+        results += uploader.upload(entries)
+    finally:
+        uploader.close()
     
-    ftp.quit()
+    print_upload_report(results)
+    uploaded_count = sum(1 for result in results if result["ok"])
     print(f"Deploy completed! {uploaded_count} files uploaded to FTP")
 
 if __name__ == "__main__":
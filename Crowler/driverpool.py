@@ -0,0 +1,188 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+
+def process_tree_rss_mb(pid) -> float:
+    """Resident memory of a process and all its descendants in MB (Linux /proc only)"""
+    children = {}
+    rss_kb = {}
+    try:
+        proc_entries = os.listdir("/proc")
+    except OSError:
+        return 0.0
+
+    for entry in proc_entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces, so split after its closing paren
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{entry}/statm", "r") as f:
+                resident_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss_kb[int(entry)] = resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        total_kb += rss_kb.get(current, 0)
+        pending.extend(children.get(current, []))
+    return total_kb / 1024
+
+
+def _session_broken(driver, error) -> bool:
+    """Whether a browser that raised `error` can no longer be handed out"""
+    # Only reached with a live driver, so Selenium is already loaded
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    if isinstance(error, WebDriverException) and not isinstance(error, TimeoutException):
+        return True
+    try:
+        driver.current_url  # Cheap liveness check: one round trip to chromedriver
+    except Exception:
+        return True
+    return False
+
+
+class _Worker:
+    """A pooled browser and how much it has been used"""
+
+    def __init__(self, driver, generation=0):
+        self.driver = driver
+        self.pages = 0
+        self.generation = generation
+
+    @property
+    def rss_mb(self):
+        process = getattr(self.driver.service, "process", None)
+        return process_tree_rss_mb(process.pid) if process else 0.0
+
+
+class DriverPool:
+    """Keep up to `size` warm browsers and recycle them after `max_pages` or `max_rss_mb`
+
+    Under memory pressure shed() restarts every browser and lowers how many may run
+    at once; restore() raises the limit again, one browser at a time, up to `size`.
+    """
+
+    def __init__(self, factory, size=1, max_pages=200, max_rss_mb=0):
+        self.factory = factory
+        self.size = max(1, size)
+        self.limit = self.size
+        self.in_use = 0
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.idle = queue.LifoQueue()
+        self.available = threading.Condition()
+        self.lock = threading.Lock()
+        self.workers = set()
+        self.generation = 0
+        self.retired_commands = 0
+
+    @property
+    def command_count(self):
+        """WebDriver commands issued by every browser this pool has run"""
+        with self.lock:
+            live = sum(worker.driver.command_count for worker in self.workers)
+            return self.retired_commands + live
+
+    @contextmanager
+    def driver(self):
+        """Check out a browser for one page; it is recycled instead of returned when worn out"""
+        with self.available:
+            while self.in_use >= self.limit:
+                self.available.wait()
+            self.in_use += 1
+        worker = None
+        try:
+            worker = self._checkout()
+            yield worker.driver
+        except Exception as e:
+            if worker is not None:
+                worker.pages += 1
+                # A page timing out or missing its markup leaves the browser usable
+                if _session_broken(worker.driver, e):
+                    self._retire(worker)
+                else:
+                    self._checkin(worker)
+            raise
+        else:
+            worker.pages += 1
+            self._checkin(worker)
+        finally:
+            with self.available:
+                self.in_use -= 1
+                self.available.notify()
+
+    def _checkout(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            worker = _Worker(self.factory(), self.generation)
+            with self.lock:
+                self.workers.add(worker)
+            return worker
+
+    def _checkin(self, worker):
+        if worker.generation < self.generation:
+            print("Restarting browser to free memory")
+            self._retire(worker)
+        elif self.max_pages and worker.pages >= self.max_pages:
+            print(f"Recycling browser after {worker.pages} pages")
+            self._retire(worker)
+        elif self.max_rss_mb and worker.rss_mb > self.max_rss_mb:
+            print(f"Recycling browser above {self.max_rss_mb} MB")
+            self._retire(worker)
+        else:
+            self.idle.put(worker)
+
+    def _retire(self, worker):
+        with self.lock:
+            self.workers.discard(worker)
+            self.retired_commands += worker.driver.command_count
+        try:
+            worker.driver.quit()
+        except Exception as e:
+            print(f"Error quitting browser: {e}")
+
+    def shed(self):
+        """Quit idle browsers now, restart busy ones when their page is done, run one fewer"""
+        with self.available:
+            self.generation += 1
+            self.limit = max(1, self.limit - 1)
+            limit = self.limit
+        idle = 0
+        while True:
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(worker)
+            idle += 1
+        print(f"Shed browsers: {idle} idle quit, at most {limit} of {self.size} running")
+
+    def restore(self):
+        """Allow one more browser again; returns False once the pool is back to its size"""
+        with self.available:
+            if self.limit >= self.size:
+                return False
+            self.limit += 1
+            self.available.notify()
+            return True
+
+    def close(self):
+        """Quit every browser the pool still owns"""
+        with self.lock:
+            workers = list(self.workers)
+        for worker in workers:
+            self._retire(worker)
+        while True:
+            try:
+                self.idle.get_nowait()
+            except queue.Empty:
+                break
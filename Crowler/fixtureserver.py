@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for jobs.jobvite.com used by the benchmarks.
+
+It replays pages saved by recorder.py, or generates a synthetic board of any size,
+with a configurable delay per response. Point the crawler at it with
+JOBVITE_BASE_URL=http://127.0.0.1:8765/leantechio/
+
+Usage:
+  python3 fixtureserver.py --snapshots snapshots                # Replay a recorded board
+  python3 fixtureserver.py --jobs 5000 --latency 0.2            # Synthetic board, 200ms per page
+  python3 fixtureserver.py --snapshots snapshots --jobs 5000    # Synthetic board with recorded descriptions
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from html import escape
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from recorder import SNAPSHOT_MANIFEST
+
+DEFAULT_BOARD_PATH = "/leantechio/"
+
+# Jobvite shows this many postings before a 'Show More' link
+DEFAULT_PAGE_SIZE = 50
+
+# A synthetic board answers under any company slug, so multi-board runs work too
+SYNTHETIC_PATH = re.compile(r"^(/[^/]+/)(?:job/([^/]+))?$")
+
+SYNTHETIC_TITLES = [
+    "Senior Python Developer", "Frontend Engineer (React)", "Data Engineer",
+    "DevOps Engineer", "QA Automation Analyst", "Product Designer",
+    "Engineering Manager", "Mobile Developer (Flutter)", "Site Reliability Engineer",
+    "Machine Learning Engineer",
+]
+SYNTHETIC_SECTORS = ["Engineering", "Data", "Design", "Operations"]
+SYNTHETIC_WORK_MODES = ["Remote", "Hybrid", "On-site"]
+SYNTHETIC_COUNTRIES = ["Brazil", "Argentina", "Colombia", "Mexico", "Uruguay"]
+
+# Roughly the size and shape of a real posting, inline styles included
+SYNTHETIC_DESCRIPTION = """
+<p><span style="background-color: rgb(255,255,255);"><b>About the role</b></span></p>
+<p>We are looking for a {title} to join a distributed team building products for clients
+across the Americas. You will own features end to end, from design discussions to production.</p>
+<p><b>Responsibilities</b></p>
+<ul>
+<li>Design, build and maintain reliable services and interfaces</li>
+<li>Review code and mentor other engineers</li>
+<li>Work closely with product and design on priorities</li>
+<li>Monitor, troubleshoot and improve systems in production</li>
+</ul>
+<p><b>Requirements</b></p>
+<ul>
+<li>4+ years of professional experience</li>
+<li>Advanced English</li>
+<li>Experience with cloud platforms and CI/CD</li>
+</ul>
+<p><span style="background-color: rgb(255,255,255);">Posting {number} of a synthetic board.</span></p>
+"""
+
+class FixtureServer:
+    """Serve recorded or synthetic Jobvite pages from a background thread"""
+
+    def __init__(self, snapshots_dir=None, jobs=0, page_size=DEFAULT_PAGE_SIZE,
+                 latency=0.0, jitter=0.0, host="127.0.0.1", port=0):
+        self.snapshots_dir = snapshots_dir
+        self.manifest = {"pages": {}, "detailPages": []}
+        if snapshots_dir:
+            with open(os.path.join(snapshots_dir, SNAPSHOT_MANIFEST), 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        self.board_path = self.manifest.get("boardPath") or DEFAULT_BOARD_PATH
+        self.jobs = jobs
+        self.page_size = max(1, page_size)
+        self.latency = latency
+        self.jitter = jitter
+        self.requests_served = 0
+        self.lock = threading.Lock()
+        self.httpd = _FixtureHTTPServer((host, port), _FixtureHandler)
+        self.httpd.fixture = self
+        self.thread = None
+
+    @property
+    def origin(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return self.origin + self.board_path
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def delay(self):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+    def _snapshot(self, file) -> str:
+        with open(os.path.join(self.snapshots_dir, file), 'r', encoding='utf-8') as f:
+            html = f.read()
+        # Keep absolute 'Show More' and job links on this server
+        return html.replace(self.manifest["origin"], self.origin) if self.manifest.get("origin") else html
+
+    def render(self, path):
+        """Return the HTML for a request path, or None for a 404"""
+        parsed = urlparse(path)
+        if self.jobs:
+            match = SYNTHETIC_PATH.match(parsed.path)
+            if not match:
+                return None
+            board_path, jobvite_id = match.groups()
+            if jobvite_id:
+                return self._synthetic_detail_page(jobvite_id)
+            page = int(parse_qs(parsed.query).get("p", ["1"])[0])
+            return self._synthetic_list_page(board_path, page)
+
+        file = self.manifest["pages"].get(path)
+        return self._snapshot(file) if file else None
+
+    def _synthetic_list_page(self, board_path, page):
+        first = (page - 1) * self.page_size
+        if page < 1 or first >= self.jobs:
+            return None
+        rows = []
+        for number in range(first, min(first + self.page_size, self.jobs)):
+            title = SYNTHETIC_TITLES[number % len(SYNTHETIC_TITLES)]
+            rows.append(
+                f'<tr><td class="jv-job-list-name"><a href="{board_path}job/{synthetic_id(number)}">'
+                f'{escape(title)}</a></td><td class="jv-job-list-location">'
+                f'{SYNTHETIC_COUNTRIES[number % len(SYNTHETIC_COUNTRIES)]}</td></tr>'
+            )
+        show_more = ""
+        if first + self.page_size < self.jobs:
+            show_more = f'<a class="jv-button" href="{board_path}?p={page + 1}">Show More</a>'
+        return (f'<html><body><table class="jv-job-list">{"".join(rows)}</table>'
+                f'{show_more}</body></html>')
+
+    def _synthetic_detail_page(self, jobvite_id):
+        number = synthetic_number(jobvite_id)
+        if number is None or number >= self.jobs:
+            return None
+        detail_pages = self.manifest.get("detailPages")
+        if detail_pages:
+            # Real markup makes the parse cost realistic
+            return self._snapshot(detail_pages[number % len(detail_pages)])
+
+        title = SYNTHETIC_TITLES[number % len(SYNTHETIC_TITLES)]
+        meta = (f'{SYNTHETIC_SECTORS[number % len(SYNTHETIC_SECTORS)]}<span class="jv-inline-separator"></span>'
+                f'{SYNTHETIC_WORK_MODES[number % len(SYNTHETIC_WORK_MODES)]}, '
+                f'{SYNTHETIC_COUNTRIES[number % len(SYNTHETIC_COUNTRIES)]}')
+        description = SYNTHETIC_DESCRIPTION.format(title=escape(title), number=number + 1)
+        return (f'<html><body><h2 class="jv-header">{escape(title)}</h2>'
+                f'<p class="jv-job-detail-meta">{meta}</p>'
+                f'<div class="jv-job-detail-description">{description}</div></body></html>')
+
+def synthetic_id(number) -> str:
+    return f"syn{number:07d}"
+
+def synthetic_number(jobvite_id):
+    if jobvite_id.startswith("syn") and jobvite_id[3:].isdigit():
+        return int(jobvite_id[3:])
+    return None
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        fixture = self.server.fixture
+        fixture.delay()
+        html = fixture.render(self.path)
+        with fixture.lock:
+            fixture.requests_served += 1
+
+        body = (html if html is not None else "<html><body>Not Found</body></html>").encode('utf-8')
+        self.send_response(200 if html is not None else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Thousands of requests per benchmark would drown the output
+
+class _FixtureHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Benchmarks time out and cancel requests; a client hanging up is not worth a traceback
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded or synthetic Jobvite pages locally")
+    parser.add_argument("--snapshots", help="Directory written by recorder.py")
+    parser.add_argument("--jobs", type=int, default=0, help="Generate a synthetic board with this many postings")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Postings per list page")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to this many seconds")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if not args.snapshots and not args.jobs:
+        parser.error("pass --snapshots, --jobs or both")
+
+    server = FixtureServer(args.snapshots, args.jobs, args.page_size, args.latency, args.jitter,
+                           args.host, args.port)
+    print(f"Serving {'a synthetic board of ' + str(args.jobs) + ' jobs' if args.jobs else args.snapshots} "
+          f"at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
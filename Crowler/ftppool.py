@@ -0,0 +1,167 @@
+import os
+import time
+import queue
+import posixpath
+import metrics
+from ftplib import FTP, error_perm, all_errors
+from concurrent.futures import ThreadPoolExecutor
+
+def get_ftp_config() -> dict:
+    """Read FTP credentials from environment variables"""
+    config = {
+        "host": os.getenv('FTP_HOST'),
+        "username": os.getenv('FTP_USERNAME'),
+        "password": os.getenv('FTP_PASSWORD'),
+        "directory": os.getenv('FTP_DIRECTORY'),
+    }
+
+    # Validate that all required environment variables are set
+    if not all(config.values()):
+        raise ValueError("Missing required FTP environment variables. Please check your .env file.")
+
+    # Optional, e.g. a local test server on an unprivileged port
+    config["port"] = int(os.getenv('FTP_PORT', '21'))
+    return config
+
+def connect(config) -> FTP:
+    """Open a logged-in connection positioned in the target directory"""
+    ftp = FTP()
+    ftp.connect(config["host"], config.get("port", 21))
+    ftp.login(config["username"], config["password"])
+    ftp.cwd(config["directory"])
+    return ftp
+
+class FtpUploader:
+    """Upload files over a pool of logged-in connections, creating each directory once
+
+    One executor and at most `connections` logins serve every upload() call; a connection
+    goes back to the idle queue after each file and is only closed when it breaks.
+    """
+
+    def __init__(self, config, connections=None, retries=None, backoff=1.0):
+        self.config = config
+        self.connections = max(1, connections or int(os.getenv('FTP_CONNECTIONS', '4')))
+        self.retries = retries if retries is not None else int(os.getenv('FTP_RETRIES', '3'))
+        self.backoff = backoff
+        # Connection used for listings, directories, deletes and manifests
+        self.control = connect(config)
+        self.known_dirs = {""}
+        self.idle = queue.LifoQueue(maxsize=self.connections)
+        self.executor = ThreadPoolExecutor(max_workers=self.connections)
+
+    def _checkout(self) -> FTP:
+        """An idle logged-in connection, or a new one while fewer than `connections` are in use"""
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            return connect(self.config)
+
+    def _checkin(self, ftp):
+        try:
+            self.idle.put_nowait(ftp)
+        except queue.Full:
+            _quit(ftp)
+
+    def ensure_dirs(self, remote_paths):
+        """Create every missing parent directory of remote_paths, each at most once"""
+        for remote_path in remote_paths:
+            parts = posixpath.dirname(remote_path).split("/")
+            for depth in range(1, len(parts) + 1):
+                directory = "/".join(parts[:depth])
+                if directory in self.known_dirs:
+                    continue
+                try:
+                    self.control.mkd(directory)
+                    print(f"Created directory: {directory}")
+                except error_perm:
+                    pass  # Directory already exists; a real problem surfaces on STOR
+                self.known_dirs.add(directory)
+
+    def store(self, ftp, file, remote_path):
+        """STOR under a temporary name, then RNFR/RNTO it over remote_path"""
+        directory, name = posixpath.split(remote_path)
+        temp_path = posixpath.join(directory, f".{name}.uploading")
+        ftp.storbinary(f'STOR {temp_path}', file)
+        try:
+            ftp.rename(temp_path, remote_path)
+        except error_perm:
+            # Some servers refuse to rename over an existing file
+            try:
+                ftp.delete(remote_path)
+            except error_perm:
+                pass
+            ftp.rename(temp_path, remote_path)
+
+    def _upload_one(self, local_path, remote_path) -> dict:
+        result = {"path": remote_path, "ok": False, "attempts": 0, "bytes": 0, "error": None}
+        for attempt in range(1, self.retries + 2):
+            result["attempts"] = attempt
+            ftp = None
+            try:
+                ftp = self._checkout()
+                with metrics.current.timer("upload_latency_seconds"), open(local_path, 'rb') as file:
+                    self.store(ftp, file, remote_path)
+                self._checkin(ftp)
+                result["ok"] = True
+                result["bytes"] = os.path.getsize(local_path)
+                result["error"] = None
+                metrics.current.inc("files_uploaded_total")
+                metrics.current.inc("bytes_uploaded_total", result["bytes"])
+                print(f"Uploaded: {remote_path}")
+                return result
+            except all_errors as e:
+                result["error"] = str(e)
+                # The connection may be broken, so the next attempt logs in again
+                if ftp is not None:
+                    ftp.close()
+                metrics.current.inc("upload_retries_total")
+                if attempt <= self.retries:
+                    time.sleep(self.backoff * 2 ** (attempt - 1))
+        print(f"Error uploading {remote_path}: {result['error']}")
+        metrics.current.error("upload", result["error"], path=remote_path)
+        return result
+
+    def upload(self, files, ordered=False) -> list:
+        """Upload (local_path, remote_path) pairs and return a result per file
+
+        Files go up in parallel, or one after another in the given order with `ordered`
+        (still over a pooled connection), e.g. index files that must be swapped in last.
+        An ordered batch stops at the first failure; the rest are reported as skipped.
+        """
+        files = list(files)
+        self.ensure_dirs(remote_path for _, remote_path in files)
+        if ordered:
+            results = []
+            for local_path, remote_path in files:
+                if results and not results[-1]["ok"]:
+                    results.append({"path": remote_path, "ok": False, "attempts": 0, "bytes": 0,
+                                    "error": "skipped after an earlier failure in the batch"})
+                else:
+                    results.append(self._upload_one(local_path, remote_path))
+            return results
+        return list(self.executor.map(lambda pair: self._upload_one(*pair), files))
+
+    def close(self):
+        self.executor.shutdown()
+        _quit(self.control)
+        while True:
+            try:
+                _quit(self.idle.get_nowait())
+            except queue.Empty:
+                break
+
+def _quit(ftp):
+    try:
+        ftp.quit()
+    except all_errors:
+        ftp.close()
+
+def print_upload_report(results):
+    uploaded = [result for result in results if result["ok"]]
+    failed = [result for result in results if not result["ok"]]
+    retried = [result for result in uploaded if result["attempts"] > 1]
+    total_bytes = sum(result["bytes"] for result in uploaded)
+    print(f"Upload report: {len(uploaded)} uploaded ({total_bytes} bytes), "
+          f"{len(retried)} needed retries, {len(failed)} failed")
+    for result in failed:
+        print(f"  FAILED {result['path']} after {result['attempts']} attempts: {result['error']}")
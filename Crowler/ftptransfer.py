@@ -1,60 +1,206 @@
 import os
-from ftplib import FTP
+import io
+import json
+import hashlib
+import posixpath
+from ftplib import error_perm
 from dotenv import load_dotenv
+from atomicfile import write_atomic
+from ftppool import FtpUploader, get_ftp_config, print_upload_report
+from indexbuilder import INDEX_FILES
+from boards import get_boards
+from blobstore import BLOBS_DIR, BLOB_NAME
 
 # Load environment variables from .env file
 load_dotenv()
 
-def upload_jobs_to_ftp():
-    # Get FTP credentials from environment variables
-    ftp_host = os.getenv('FTP_HOST')
-    ftp_username = os.getenv('FTP_USERNAME')
-    ftp_password = os.getenv('FTP_PASSWORD')
-    ftp_directory = os.getenv('FTP_DIRECTORY')
-    
-    # Validate that all required environment variables are set
-    if not all([ftp_host, ftp_username, ftp_password, ftp_directory]):
-        raise ValueError("Missing required FTP environment variables. Please check your .env file.")
-    
-    ftp = FTP(ftp_host)
-    ftp.login(ftp_username, ftp_password)
-    ftp.cwd(ftp_directory) 
-    
-    # Upload jobs.json file
-    with open('jobs.json', 'rb') as file:
-        ftp.storbinary('STOR jobs.json', file)
-    print("jobs.json uploaded successfully")
-    
-    # Upload jobs directory
-    jobs_dir = "jobs"
+# Content hashes of what is on the server, stored next to jobs.json
+REMOTE_MANIFEST = "jobs-manifest.json"
+
+# Cache of local content hashes so unchanged files are not re-hashed every run
+LOCAL_MANIFEST = "upload-manifest.json"
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def build_local_manifest(out_dir="") -> dict:
+    """Map each path (relative to the board's directory) to the content hash of its local file"""
+    jobs_dir = os.path.join(out_dir, "jobs")
+    local_manifest_path = os.path.join(out_dir, LOCAL_MANIFEST)
+    try:
+        with open(local_manifest_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    files = [(os.path.join(out_dir, name), name) for name in INDEX_FILES
+             if os.path.exists(os.path.join(out_dir, name))]
     if os.path.exists(jobs_dir):
-        # Create jobs directory on FTP server
+        for file in sorted(os.listdir(jobs_dir)):
+            if file.endswith('.json'):
+                files.append((os.path.join(jobs_dir, file), f'jobs/{file}'))
+
+    manifest = {}
+    new_cache = {}
+    # A blob's name is its content hash, so it never needs hashing again
+    blobs_dir = os.path.join(out_dir, BLOBS_DIR)
+    if os.path.exists(blobs_dir):
+        for file in sorted(os.listdir(blobs_dir)):
+            if BLOB_NAME.match(file):
+                manifest[f'{BLOBS_DIR}/{file}'] = file[:-len('.html')]
+
+    for local_path, remote_path in files:
+        stat = os.stat(local_path)
+        cached = cache.get(remote_path)
+        if cached and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime:
+            sha256 = cached["sha256"]
+        else:
+            sha256 = file_sha256(local_path)
+        manifest[remote_path] = sha256
+        new_cache[remote_path] = {"sha256": sha256, "size": stat.st_size, "mtime": stat.st_mtime}
+
+    write_atomic(local_manifest_path, json.dumps(new_cache))
+
+    return manifest
+
+def load_remote_manifest(ftp, prefix="") -> dict:
+    """Learn the remote state from one manifest download, or one listing if there is none"""
+    buffer = io.BytesIO()
+    try:
+        ftp.retrbinary(f'RETR {posixpath.join(prefix, REMOTE_MANIFEST)}', buffer.write)
+        return json.loads(buffer.getvalue().decode('utf-8'))["files"]
+    except (error_perm, ValueError, KeyError):
+        print("Remote manifest not found, listing remote jobs directory")
+
+    # Without hashes every listed file is treated as changed, but still known for deletion
+    manifest = {}
+    for directory in ('jobs', BLOBS_DIR):
         try:
-            ftp.mkd('jobs')
-        except:
-            pass  # Directory might already exist
-        
-        # Get all HTML files from jobs directory
-        jobs_files = []
-        for file in os.listdir(jobs_dir):
-            if file.endswith('.html'):
-                local_path = os.path.join(jobs_dir, file)
-                remote_path = f'jobs/{file}'
-                jobs_files.append((local_path, remote_path))
-        
-        # Upload each HTML file
-        for local_path, remote_path in jobs_files:
-            if ftp.nlst(remote_path):
-                print(f"File {remote_path} already exists")
-                continue
-            
-            with open(local_path, 'rb') as file:
-                ftp.storbinary(f'STOR {remote_path}', file)
-            print(f"Uploaded: {remote_path}")
-        
-        print(f"Uploaded {len(jobs_files)} job description files")
-    else:
-        print("Warning: jobs directory does not exist")
-    
-    ftp.quit()
-    print("All files uploaded successfully to FTP")
\ No newline at end of file
+            names = ftp.nlst(posixpath.join(prefix, directory))
+        except error_perm:
+            names = []
+        manifest.update({f'{directory}/{posixpath.basename(name)}': None
+                         for name in names if name.endswith(('.html', '.json'))})
+    return manifest
+
+def files_to_delete(local_manifest, remote_manifest) -> list:
+    """Remote paths the local board no longer has, or none while its index is incomplete
+
+    A board directory without its index (an empty or half-written out dir) would otherwise
+    make every published shard and blob look obsolete.
+    """
+    missing = [path for path in INDEX_FILES if path in remote_manifest and path not in local_manifest]
+    if "jobs.json" not in local_manifest or missing:
+        print(f"Not deleting remote files: the local index lacks {', '.join(missing) or 'jobs.json'}")
+        return []
+    return [path for path in remote_manifest if path not in local_manifest]
+
+def save_remote_manifest(uploader, manifest, prefix=""):
+    content = json.dumps({"files": manifest}).encode('utf-8')
+    remote_path = posixpath.join(prefix, REMOTE_MANIFEST)
+    uploader.ensure_dirs([remote_path])
+    uploader.store(uploader.control, io.BytesIO(content), remote_path)
+
+def upload_jobs_to_ftp(slugs=None):
+    """Sync every board's output (or only the boards in `slugs`) to the FTP server, each under its own directory"""
+    config = get_ftp_config()
+    boards = [board for board in get_boards() if slugs is None or board["slug"] in slugs]
+
+    uploader = FtpUploader(config)
+    results = []
+    changed = removed = 0
+    try:
+        for board in boards:
+            board_results, board_changed, board_removed = upload_board(uploader, board["outDir"], board["remoteDir"])
+            results += board_results
+            changed += board_changed
+            removed += board_removed
+    finally:
+        uploader.close()
+
+    failed = [result["path"] for result in results if not result["ok"]]
+    if failed:
+        raise RuntimeError(f"{len(failed)} files failed to upload: {', '.join(failed)}")
+    print(f"All files synced to FTP: {changed} uploaded, {removed} deleted")
+
+def upload_board(uploader, out_dir="", prefix=None):
+    """Delta-sync one board directory; returns (results, uploaded count, deleted count)"""
+    jobs_file = os.path.join(out_dir, "jobs.json")
+    if not os.path.exists(jobs_file):
+        raise FileNotFoundError(f"{jobs_file} does not exist; run a sync before uploading")
+    jobs_dir = os.path.join(out_dir, "jobs")
+    if not os.path.exists(jobs_dir):
+        print(f"Warning: {jobs_dir} directory does not exist")
+
+    # Remote layout mirrors the local one: boards/{slug}/... or the FTP directory itself
+    if prefix is None:
+        prefix = out_dir.replace(os.sep, "/")
+
+    def remote(path):
+        return posixpath.join(prefix, path)
+
+    def local(path):
+        return os.path.join(out_dir, *path.split("/"))
+
+    if prefix:
+        print(f"Uploading board directory {prefix}")
+    local_manifest = build_local_manifest(out_dir)
+    ftp = uploader.control
+    remote_manifest = load_remote_manifest(ftp, prefix)
+
+    changed = [path for path, sha256 in local_manifest.items() if remote_manifest.get(path) != sha256]
+    stale = [path for path in remote_manifest if path not in local_manifest]
+    removed = files_to_delete(local_manifest, remote_manifest)
+    print(f"{len(changed)} files to upload, {len(removed)} files to delete, "
+          f"{len(local_manifest) - len(changed)} unchanged")
+
+    # Descriptions and shards go first so the new index never references a missing file
+    descriptions = [path for path in changed if path not in INDEX_FILES]
+    indexes = [path for path in INDEX_FILES if path in changed]
+    results = uploader.upload((local(path), remote(path)) for path in descriptions)
+
+    index_published = True
+    if indexes:
+        if all(result["ok"] for result in results):
+            # One batch, sent in INDEX_FILES order, each file swapped in with RNFR/RNTO
+            index_results = uploader.upload([(local(path), remote(path)) for path in indexes], ordered=True)
+            results += index_results
+            # A stale jobs.json.gz would still be served, so every variant must be current
+            index_published = all(result["ok"] for result in index_results)
+        else:
+            print("Keeping the previous index because some descriptions failed to upload")
+            results += [{"path": remote(path), "ok": False, "attempts": 0, "bytes": 0,
+                         "error": "skipped after failed description uploads"} for path in indexes]
+            index_published = False
+    print_upload_report(results)
+
+    # Old descriptions are deleted only after the index stopped referencing them
+    # Still referenced by the live index: kept in the manifest and deleted on a later run
+    if not index_published:
+        removed = []
+    kept = {path: remote_manifest[path] for path in stale if path not in removed}
+    for remote_path in removed:
+        try:
+            ftp.delete(remote(remote_path))
+            print(f"Deleted: {remote(remote_path)}")
+        except error_perm as e:
+            print(f"Error deleting {remote(remote_path)}: {e}")
+
+    # A failed file keeps its old hash so the next run uploads it again
+    new_manifest = dict(local_manifest, **kept)
+    for result in results:
+        if not result["ok"]:
+            path = posixpath.relpath(result["path"], prefix) if prefix else result["path"]
+            if remote_manifest.get(path):
+                new_manifest[path] = remote_manifest[path]
+            else:
+                new_manifest.pop(path, None)
+
+    # Written last, so an interrupted run is simply retried against the old manifest
+    save_remote_manifest(uploader, new_manifest, prefix)
+
+    return results, len(changed), len(removed)
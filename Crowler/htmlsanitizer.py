@@ -0,0 +1,249 @@
+import os
+import re
+import json
+from html import escape
+from html.entities import html5
+from html.parser import HTMLParser
+
+# Elements that never have a closing tag and must not be pushed on the stack
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+# What a description may contain once cleaned; everything else is unwrapped or dropped
+DEFAULT_RULES = {
+    "allowed_tags": [
+        "p", "br", "ul", "ol", "li", "b", "strong", "i", "em", "u", "a",
+        "h2", "h3", "h4", "blockquote", "table", "thead", "tbody", "tr", "th", "td",
+    ],
+    # Rewritten before the allowlist check: div/section become paragraphs, h1 a subheading
+    "rename_tags": {"div": "p", "section": "p", "h1": "h2", "h5": "h4", "h6": "h4"},
+    # Removed together with everything inside them
+    "drop_content_tags": ["script", "style", "iframe", "object", "embed", "noscript", "svg", "form", "button"],
+    "allowed_attributes": {"a": ["href"], "td": ["colspan", "rowspan"], "th": ["colspan", "rowspan"]},
+    "allowed_url_schemes": ["http", "https", "mailto"],
+    # Remove elements left with no text, e.g. "<span style=...></span>" or "<p>&nbsp;</p>"
+    "drop_empty": True,
+}
+
+# Tags that open a new block: they close an open paragraph, and whitespace around them is dropped
+BLOCK_TAGS = {"p", "ul", "ol", "li", "h2", "h3", "h4", "blockquote", "table", "thead", "tbody", "tr", "th", "td"}
+
+# Containers that may hold a paragraph; an open <p> is only searched for up to them
+CONTAINER_TAGS = {"li", "td", "th", "blockquote"}
+
+# Kept even without text so tables keep their shape
+KEEP_EMPTY_TAGS = {"td", "th"}
+
+# Block tags that cannot sit inside a paragraph
+PARAGRAPH_BREAKING_TAGS = {"p", "li", "ul", "ol", "table", "h2", "h3", "h4", "blockquote"}
+
+# A list item closes an open sibling item, but not one of an outer list
+LIST_TAGS = {"ul", "ol"}
+
+WHITESPACE = re.compile(r"\s+")
+EMPTY_TEXT = re.compile(r"^(?:\s|&nbsp;|&#160;|&#xa0;)*$", re.IGNORECASE)
+URL_NOISE = re.compile(r"[\x00-\x20]+")
+
+def entityref_html(name) -> str:
+    """Markup for an "&name" reference: a known entity as it is, anything else as literal text
+
+    "R&D " reaches the parser as a reference to "D"; writing it back as "&D;" would change the text.
+    """
+    return f"&{name};" if f"{name};" in html5 else f"&amp;{name}"
+
+def load_rules() -> dict:
+    """DEFAULT_RULES, with keys overridden by the JSON file in DESCRIPTION_RULES_FILE"""
+    rules = dict(DEFAULT_RULES)
+    rules_file = os.getenv('DESCRIPTION_RULES_FILE')
+    if rules_file:
+        with open(rules_file, 'r', encoding='utf-8') as f:
+            rules.update(json.load(f))
+    return rules
+
+class _Element:
+    """An open source element and what was emitted for it (None: unwrapped)"""
+
+    def __init__(self, tag, emitted, start):
+        self.tag = tag
+        self.emitted = emitted
+        self.start = start
+        self.has_content = False
+
+class DescriptionSanitizer(HTMLParser):
+    """Sanitize and minify description markup in one streaming pass
+
+    Tags are renamed or unwrapped to fit the allowlist, attributes are stripped
+    (inline styles included), unsafe links and comments are dropped, whitespace
+    is collapsed, and elements left empty are removed.
+    """
+
+    def __init__(self, rules=None):
+        super().__init__(convert_charrefs=False)
+        rules = rules or DEFAULT_RULES
+        self.allowed_tags = set(rules["allowed_tags"])
+        self.rename_tags = dict(rules["rename_tags"])
+        self.drop_content_tags = set(rules["drop_content_tags"])
+        self.allowed_attributes = {tag: set(names) for tag, names in rules["allowed_attributes"].items()}
+        self.allowed_url_schemes = set(rules["allowed_url_schemes"])
+        self.drop_empty = rules["drop_empty"]
+        self.out = []
+        self.stack = []
+        self.skip = 0
+        self.block_boundary = True
+
+    # Output helpers
+
+    def _emit_text(self, text):
+        if self.block_boundary:
+            text = text.lstrip()
+        if not text:
+            return
+        # Runs of whitespace, including across adjacent text chunks, become one space
+        if text.startswith(" ") and self.out and self.out[-1].endswith(" "):
+            text = text[1:]
+        self.out.append(text)
+        self.block_boundary = False
+        if not EMPTY_TEXT.match(text):
+            for element in self.stack:
+                element.has_content = True
+
+    def _trim_trailing_space(self):
+        if self.out and not self.out[-1].startswith("<"):
+            self.out[-1] = self.out[-1].rstrip()
+            if not self.out[-1]:
+                self.out.pop()
+
+    def _attributes(self, tag, attrs):
+        allowed = self.allowed_attributes.get(tag, ())
+        parts = []
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name == "href":
+                # Browsers ignore whitespace and control characters in "java\tscript:"
+                url = URL_NOISE.sub("", value)
+                scheme = url.split(":", 1)[0].lower() if ":" in url.split("/", 1)[0] else ""
+                if scheme and scheme not in self.allowed_url_schemes:
+                    continue  # javascript:, data: and friends
+            parts.append(f' {name}="{escape(value)}"')
+        return "".join(parts)
+
+    def _open(self, tag, emitted, attrs):
+        if emitted in BLOCK_TAGS:
+            self._trim_trailing_space()
+            if emitted in PARAGRAPH_BREAKING_TAGS:
+                self._close_open("p", CONTAINER_TAGS)
+            if emitted == "li":
+                self._close_open("li", LIST_TAGS)
+        attributes = self._attributes(emitted, attrs) if emitted else ""
+        if emitted == "a" and not attributes:
+            emitted = None  # A link without a safe href is just text
+        element = _Element(tag, emitted, len(self.out))
+        if emitted:
+            self.out.append(f"<{emitted}{attributes}>")
+            if emitted in BLOCK_TAGS:
+                self.block_boundary = True
+        return element
+
+    def _close(self, element):
+        if not element.emitted:
+            return
+        if self.drop_empty and not element.has_content and element.emitted not in KEEP_EMPTY_TAGS:
+            # Nothing visible was written inside: drop the whole element
+            del self.out[element.start:]
+            return
+        if element.emitted in BLOCK_TAGS:
+            self._trim_trailing_space()
+            self.block_boundary = True
+        self.out.append(f"</{element.emitted}>")
+        for parent in self.stack:
+            parent.has_content = True
+
+    def _close_open(self, emitted, boundaries):
+        """Implied end tags: close an open `emitted` (and what is open inside it) early
+
+        Paragraphs cannot nest and "<li>a<li>b" are siblings. The search stops at the
+        nearest of `boundaries`, so an item never closes the item holding its list.
+        """
+        for index in range(len(self.stack) - 1, -1, -1):
+            element = self.stack[index]
+            if element.emitted in boundaries:
+                return
+            if element.emitted == emitted:
+                for inner in reversed(self.stack[index:]):
+                    self._close(inner)
+                    inner.emitted = None
+                return
+
+    # HTMLParser callbacks
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip or tag in self.drop_content_tags:
+            if tag not in VOID_ELEMENTS:
+                self.skip += 1
+            return
+        emitted = self.rename_tags.get(tag, tag)
+        if emitted not in self.allowed_tags:
+            emitted = None
+        element = self._open(tag, emitted, attrs)
+        if tag in VOID_ELEMENTS:
+            # A lone <br> does not make a paragraph worth keeping
+            self.block_boundary = self.block_boundary and not emitted
+            return
+        self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            self.handle_starttag(tag, attrs)
+        # "<span/>" opens nothing worth keeping
+
+    def handle_endtag(self, tag):
+        if self.skip:
+            if tag not in VOID_ELEMENTS:
+                self.skip -= 1
+            return
+        if not any(element.tag == tag for element in self.stack):
+            return  # Stray end tag
+        # Also close children the source left open
+        while self.stack:
+            element = self.stack.pop()
+            self._close(element)
+            if element.tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.skip:
+            self._emit_text(escape(WHITESPACE.sub(" ", data), quote=False))
+
+    def handle_entityref(self, name):
+        if not self.skip:
+            self._emit_text(entityref_html(name))
+
+    def handle_charref(self, name):
+        if not self.skip:
+            self._emit_text(f"&#{name};")
+
+    def handle_comment(self, data):
+        pass  # Editor comments never reach the page
+
+    def result(self) -> str:
+        self.close()
+        while self.stack:
+            self._close(self.stack.pop())
+        self._trim_trailing_space()
+        return "".join(self.out)
+
+_rules = None
+
+def sanitize_description(html, rules=None) -> str:
+    """Clean a job description with the configured rules (see load_rules)"""
+    global _rules
+    if rules is None:
+        if _rules is None:
+            _rules = load_rules()
+        rules = _rules
+    sanitizer = DescriptionSanitizer(rules)
+    sanitizer.feed(html)
+    return sanitizer.result()
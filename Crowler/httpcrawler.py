@@ -0,0 +1,87 @@
+import os
+import urllib3
+import metrics
+from urllib.parse import urljoin
+from ratelimit import get_rate_limiter
+from jobparser import parse_job_list, parse_job_detail
+
+DEFAULT_BASE_URL = "https://jobs.jobvite.com/leantechio/"
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+def get_base_url() -> str:
+    """Board URL from JOBVITE_BASE_URL, e.g. a local fixture server for benchmarks"""
+    base_url = os.getenv('JOBVITE_BASE_URL') or DEFAULT_BASE_URL
+    # urljoin drops the last path segment of a base without a trailing slash
+    return base_url if base_url.endswith("/") else base_url + "/"
+
+
+def get_session(pool_size=4):
+    """Create a pooled HTTP session; pool_size caps open connections per host"""
+    return urllib3.PoolManager(
+        maxsize=pool_size,
+        block=True,
+        headers={"User-Agent": USER_AGENT, "Accept": "text/html"},
+        retries=urllib3.Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+        timeout=urllib3.Timeout(connect=10, read=20),
+    )
+
+
+def fetch_page(session, url) -> str:
+    """GET a page and return its decoded body"""
+    get_rate_limiter().acquire(url)
+    with metrics.current.timer("page_latency_seconds", engine="http"):
+        response = session.request("GET", url)
+    metrics.current.inc("pages_fetched_total", engine="http")
+    if response.status != 200:
+        raise RuntimeError(f"GET {url} returned HTTP {response.status}")
+
+    charset = "utf-8"
+    content_type = response.headers.get("Content-Type", "")
+    if "charset=" in content_type:
+        charset = content_type.split("charset=")[-1].split(";")[0].strip()
+    return response.data.decode(charset, errors="replace")
+
+
+def get_jobs_http(session, base_url=None):
+    """Fetch the job list and follow 'Show More' pages until no new jobs appear"""
+    base_url = base_url or get_base_url()
+    jobs, pending = parse_job_list(fetch_page(session, base_url))
+    print(f"Found {len(jobs)} jobs on initial page")
+    print(f"Found {len(pending)} Show More links")
+
+    existing_ids = {job["jobviteId"] for job in jobs}
+    pending = [urljoin(base_url, href) for href in pending]
+    visited = set()
+
+    while pending:
+        url = pending.pop(0)
+        if url in visited:
+            continue
+        visited.add(url)
+
+        print(f"Loading Show More link {len(visited)}: {url}")
+        try:
+            page_jobs, show_more_links = parse_job_list(fetch_page(session, url))
+        except Exception as e:
+            print(f"Error loading link {url}: {e}")
+            continue
+
+        new_jobs = [job for job in page_jobs if job["jobviteId"] not in existing_ids]
+        # Only a page that still yields new jobs is worth paginating further
+        if new_jobs:
+            jobs.extend(new_jobs)
+            existing_ids.update(job["jobviteId"] for job in new_jobs)
+            pending.extend(urljoin(url, href) for href in show_more_links)
+
+    print(f"Total unique jobs: {len(jobs)}")
+    return jobs
+
+
+def get_job_description_http(session, jobvite_id, base_url=None) -> dict:
+    """Fetch and parse a job detail page without a browser"""
+    return parse_job_detail(fetch_page(session, urljoin(base_url or get_base_url(), f"job/{jobvite_id}")))
@@ -0,0 +1,65 @@
+import os
+import json
+import gzip
+from datetime import datetime
+from atomicfile import write_atomic
+from searchindex import build_search_index, build_facets
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only the .gz variant is written
+    brotli = None
+
+# Published after the descriptions, in this order, so jobs.json (the file clients poll)
+# always changes last and never points at a search index or shard that is not there yet
+INDEX_FILES = [
+    "search-index.json.br", "search-index.json.gz", "search-index.json",
+    "facets.json",
+    "jobs.json.br", "jobs.json.gz", "jobs.json",
+]
+
+def to_compact_json(content) -> bytes:
+    return json.dumps(content, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def write_job_shards(jobs, jobs_dir="jobs", changed_ids=None):
+    """Write jobs/{id}.json so a detail page can load one record without the full list
+
+    With changed_ids, only those shards and missing ones are rewritten.
+    """
+    for job in jobs:
+        path = os.path.join(jobs_dir, f"{job['jobviteId']}.json")
+        if changed_ids is not None and job["jobviteId"] not in changed_ids and os.path.exists(path):
+            continue
+        write_atomic(path, to_compact_json(job))
+
+def write_precompressed(content, index_file):
+    """Write minified JSON plus precompressed .gz and .br variants for static hosting"""
+    data = to_compact_json(content)
+
+    if brotli is not None:
+        write_atomic(f"{index_file}.br", brotli.compress(data, quality=11))
+    elif os.path.exists(f"{index_file}.br"):
+        os.remove(f"{index_file}.br")  # A stale variant would serve old data
+
+    # mtime=0 keeps the output byte-identical for identical input
+    write_atomic(f"{index_file}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+    write_atomic(index_file, data)
+
+    print(f"Wrote {index_file}: {len(data)} bytes, "
+          f"{os.path.getsize(f'{index_file}.gz')} gzipped"
+          + (f", {os.path.getsize(f'{index_file}.br')} brotli" if brotli is not None else ""))
+
+def export_jobs(out_dir, jobs, blob_store, last_updated=None, changed_ids=None):
+    """Write a board's shards, search index, facets and jobs.json for its open jobs"""
+    jobs_dir = os.path.join(out_dir, "jobs")
+    os.makedirs(jobs_dir, exist_ok=True)
+    json_content = {
+        "jobs": jobs,
+        "lastUpdated": (last_updated or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+    # Save updated jobs last, once every description and shard it references is in place
+    write_job_shards(jobs, jobs_dir, changed_ids)
+    write_precompressed(build_search_index(jobs, blob_store), os.path.join(out_dir, 'search-index.json'))
+    write_atomic(os.path.join(out_dir, 'facets.json'), to_compact_json(build_facets(jobs)))
+    write_precompressed(json_content, os.path.join(out_dir, 'jobs.json'))
@@ -0,0 +1,199 @@
+import re
+import metrics
+from html import unescape
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+from htmlsanitizer import VOID_ELEMENTS, entityref_html, sanitize_description
+
+# Start tags that implicitly close an open sibling, e.g. "<li>a<li>b"
+IMPLIED_END_TAGS = {
+    "li": {"li"},
+    "p": {"p"},
+    "option": {"option"},
+    "tr": {"tr", "td", "th"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+}
+
+LIST_NAME_CLASS = "jv-job-list-name"
+DESCRIPTION_CLASS = "jv-job-detail-description"
+META_CLASS = "jv-job-detail-meta"
+
+
+class MarkupError(Exception):
+    """Raised when a Jobvite page does not contain the expected markup"""
+
+
+class _Capture:
+    """An element whose innerHTML and text are being collected"""
+
+    def __init__(self, kind, tag, attrs):
+        self.kind = kind
+        self.tag = tag
+        self.attrs = attrs
+        self.stack = []
+        self.html = []
+        self.text = []
+        self.links = []
+
+    @property
+    def inner_html(self):
+        return "".join(self.html)
+
+    @property
+    def inner_text(self):
+        return " ".join("".join(self.text).split())
+
+
+class JobviteParser(HTMLParser):
+    """Collect job list rows, 'Show More' links and detail blocks from a Jobvite page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.active = []
+        self.list_items = []
+        self.show_more_links = []
+        self.blocks = {}
+
+    def _classes(self, attrs):
+        return (dict(attrs).get("class") or "").split()
+
+    def handle_starttag(self, tag, attrs):
+        raw = self.get_starttag_text()
+        for capture in self.active:
+            while capture.stack and capture.stack[-1] in IMPLIED_END_TAGS.get(tag, ()):
+                capture.html.append(f"</{capture.stack.pop()}>")
+            capture.html.append(raw)
+            if tag not in VOID_ELEMENTS:
+                capture.stack.append(tag)
+            if tag == "a" and capture.kind == LIST_NAME_CLASS:
+                capture.links.append(dict(attrs).get("href"))
+
+        if tag in VOID_ELEMENTS:
+            return
+
+        classes = self._classes(attrs)
+        if LIST_NAME_CLASS in classes:
+            self.active.append(_Capture(LIST_NAME_CLASS, tag, attrs))
+        for block_class in (DESCRIPTION_CLASS, META_CLASS):
+            if block_class in classes and block_class not in self.blocks:
+                self.active.append(_Capture(block_class, tag, attrs))
+        if tag == "a":
+            self.active.append(_Capture("a", tag, attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        raw = self.get_starttag_text()
+        for capture in self.active:
+            capture.html.append(raw)
+
+    def handle_endtag(self, tag):
+        for capture in list(self.active):
+            if tag in capture.stack:
+                # Pop implicitly closed children along with the matching tag
+                while capture.stack:
+                    open_tag = capture.stack.pop()
+                    capture.html.append(f"</{open_tag}>")
+                    if open_tag == tag:
+                        break
+            elif tag == capture.tag:
+                # Children the source left open, e.g. a trailing "<p>" or "<span>", end with it
+                while capture.stack:
+                    capture.html.append(f"</{capture.stack.pop()}>")
+                self.active.remove(capture)
+                self._finish(capture)
+
+    def _finish(self, capture):
+        if capture.kind == LIST_NAME_CLASS:
+            href = next((link for link in capture.links if link), None)
+            self.list_items.append({"href": href, "text": capture.inner_text})
+        elif capture.kind == "a":
+            href = dict(capture.attrs).get("href")
+            if href and "Show More" in capture.inner_text:
+                self.show_more_links.append(href)
+        else:
+            self.blocks.setdefault(capture.kind, capture.inner_html)
+
+    def handle_data(self, data):
+        for capture in self.active:
+            capture.html.append(data)
+            capture.text.append(data)
+
+    def handle_entityref(self, name):
+        html = entityref_html(name)
+        for capture in self.active:
+            capture.html.append(html)
+            capture.text.append(unescape(html))
+
+    def handle_charref(self, name):
+        for capture in self.active:
+            capture.html.append(f"&#{name};")
+            capture.text.append(unescape(f"&#{name};"))
+
+    def handle_comment(self, data):
+        for capture in self.active:
+            capture.html.append(f"<!--{data}-->")
+
+
+def jobvite_id_from_href(href) -> str:
+    """Return the jobviteId at the end of a job link, ignoring query strings"""
+    return urlparse(href).path.rstrip("/").split("/")[-1]
+
+
+def parse_meta_text(meta_html) -> dict:
+    """Split the detail meta markup into sector, work mode and country"""
+    # Remove HTML tags and get clean text
+    clean_text = re.sub(r'<[^>]+>', '|', meta_html)
+    clean_text = clean_text.replace('&amp;', '&')
+
+    # Split by separators (| and ,)
+    parts = [part.strip() for part in re.split(r'[|,]', clean_text) if part.strip()]
+
+    return {
+        "sector": parts[0] if len(parts) >= 1 else "",
+        "work_mode": parts[1] if len(parts) >= 2 else "",
+        "country": parts[2] if len(parts) >= 3 else ""
+    }
+
+
+def clean_description(description_html) -> str:
+    """Sanitize and minify a description's innerHTML for the site (see htmlsanitizer)"""
+    cleaned = sanitize_description(description_html)
+    metrics.current.inc("description_bytes_total", len(description_html.encode('utf-8')), stage="raw")
+    metrics.current.inc("description_bytes_total", len(cleaned.encode('utf-8')), stage="clean")
+    return cleaned
+
+
+def parse_job_list(html):
+    """Parse a Jobvite list page into job dicts and 'Show More' hrefs"""
+    parser = JobviteParser()
+    parser.feed(html)
+    parser.close()
+
+    if not parser.list_items:
+        raise MarkupError(f"no .{LIST_NAME_CLASS} elements found")
+
+    jobs = []
+    for item in parser.list_items:
+        if not item["href"] or not item["text"]:
+            continue
+        jobs.append({"jobviteId": jobvite_id_from_href(item["href"]), "jobTitle": item["text"]})
+
+    return jobs, parser.show_more_links
+
+
+def parse_job_detail(html) -> dict:
+    """Parse a Jobvite detail page into the dict returned by get_job_description"""
+    parser = JobviteParser()
+    parser.feed(html)
+    parser.close()
+
+    if DESCRIPTION_CLASS not in parser.blocks:
+        raise MarkupError(f"no .{DESCRIPTION_CLASS} element found")
+
+    meta_info = parse_meta_text(parser.blocks.get(META_CLASS, ""))
+    return {
+        "description": clean_description(parser.blocks[DESCRIPTION_CLASS]),
+        "sector": meta_info["sector"],
+        "work_mode": meta_info["work_mode"],
+        "country": meta_info["country"]
+    }
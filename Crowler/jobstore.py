@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+SQLite store of every job a board has listed, open or closed, with its history.
+
+jobs.json is exported from it after each sync. History is queried from the command line:
+  python3 jobstore.py changes --since 24h          # Opened, changed, closed and reopened jobs
+  python3 jobstore.py history <jobviteId>          # Everything that happened to one job
+  python3 jobstore.py changes --board data/boards/acme  # Another board's database
+"""
+
+import os
+import json
+import time
+import sqlite3
+import argparse
+from datetime import datetime
+
+# One per board directory, next to jobs.json
+JOBS_DB = "jobs.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    jobvite_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    sector TEXT NOT NULL DEFAULT '',
+    work_mode TEXT NOT NULL DEFAULT '',
+    country TEXT NOT NULL DEFAULT '',
+    description_hashes TEXT NOT NULL DEFAULT '[]',
+    fetched_at INTEGER,
+    position INTEGER NOT NULL DEFAULT 0,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    changed_at INTEGER NOT NULL,
+    closed_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_open ON jobs (closed_at, position);
+CREATE INDEX IF NOT EXISTS jobs_first_seen ON jobs (first_seen);
+CREATE INDEX IF NOT EXISTS jobs_changed_at ON jobs (changed_at);
+
+CREATE TABLE IF NOT EXISTS job_events (
+    jobvite_id TEXT NOT NULL,
+    at INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description_hashes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_events_at ON job_events (at);
+CREATE INDEX IF NOT EXISTS job_events_job ON job_events (jobvite_id, at);
+"""
+
+# jobs.json field -> column; descriptionHashes is stored as a JSON list
+COLUMNS = {
+    "jobTitle": "title",
+    "sector": "sector",
+    "workMode": "work_mode",
+    "country": "country",
+    "descriptionHashes": "description_hashes",
+    "fetchedAt": "fetched_at",
+}
+
+# A difference in these is a change worth an event; a refetch alone only moves fetchedAt
+TRACKED_FIELDS = ["jobTitle", "sector", "workMode", "country", "descriptionHashes"]
+
+INTERVAL_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+def _to_row(job) -> dict:
+    row = {COLUMNS[field]: job.get(field) for field in COLUMNS}
+    row["title"] = row["title"] or ""
+    for column in ("sector", "work_mode", "country"):
+        row[column] = row[column] or ""
+    row["description_hashes"] = json.dumps(job.get("descriptionHashes") or [])
+    return row
+
+def _to_job(row) -> dict:
+    job = {"jobviteId": row["jobvite_id"]}
+    for field, column in COLUMNS.items():
+        job[field] = row[column]
+    job["descriptionHashes"] = json.loads(row["description_hashes"])
+    return job
+
+class JobStore:
+    """Jobs of one board keyed by jobviteId, with first-seen/last-seen/closed timestamps
+
+    Each sync is applied as a diff: only new, changed, closed and reopened jobs are
+    written and logged to job_events, and every still-listed job's last_seen moves
+    in one statement.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        # WAL lets history queries read while a sync writes
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def is_empty(self) -> bool:
+        return self.db.execute("SELECT 1 FROM jobs LIMIT 1").fetchone() is None
+
+    def import_json(self, jobs_file) -> int:
+        """Seed an empty store from a jobs.json written before the store existed"""
+        try:
+            with open(jobs_file, 'r', encoding='utf-8') as f:
+                jobs = json.load(f).get("jobs", [])
+        except (OSError, ValueError):
+            return 0
+        now = int(os.path.getmtime(jobs_file))
+        with self.db:
+            self._insert(jobs, now)
+        print(f"Imported {len(jobs)} jobs from {jobs_file}")
+        return len(jobs)
+
+    def load_jobs(self) -> dict:
+        """Every known job, closed ones included, keyed by jobviteId"""
+        return {row["jobvite_id"]: _to_job(row) for row in self.db.execute("SELECT * FROM jobs")}
+
+    def last_synced(self):
+        """When the last sync was recorded (the newest last_seen), or None before the first"""
+        row = self.db.execute("SELECT MAX(last_seen) FROM jobs").fetchone()
+        return datetime.fromtimestamp(row[0]) if row[0] else None
+
+    def open_jobs(self) -> list:
+        """Listed jobs in board order, as they are exported to jobs.json"""
+        rows = self.db.execute("SELECT * FROM jobs WHERE closed_at IS NULL ORDER BY position")
+        return [_to_job(row) for row in rows]
+
+    def record_sync(self, jobs, now=None) -> tuple:
+        """Apply a board listing; returns ({event: count}, ids whose exported record changed)
+
+        An empty listing usually means the list page failed, so it closes nothing.
+        """
+        now = int(now or time.time())
+        existing = {row["jobvite_id"]: row for row in self.db.execute("SELECT * FROM jobs")}
+        counts = {"opened": 0, "changed": 0, "reopened": 0, "closed": 0}
+        changed_ids = set()
+        new_jobs = []
+
+        with self.db:
+            for position, job in enumerate(jobs):
+                row = existing.get(job["jobviteId"])
+                if row is None:
+                    new_jobs.append(dict(job, position=position))
+                    continue
+                current = _to_row(job)
+                differs = [column for column in current if current[column] != row[column]]
+                if row["closed_at"] is not None:
+                    event = "reopened"
+                elif any(COLUMNS[field] in differs for field in TRACKED_FIELDS):
+                    event = "changed"
+                else:
+                    event = None
+                if event:
+                    counts[event] += 1
+                    self._log(job["jobviteId"], now, event, current)
+                if differs or event:
+                    changed_ids.add(job["jobviteId"])
+                if differs or event or row["position"] != position:
+                    self.db.execute(
+                        "UPDATE jobs SET title = :title, sector = :sector, work_mode = :work_mode,"
+                        " country = :country, description_hashes = :description_hashes,"
+                        " fetched_at = :fetched_at, position = :position, closed_at = NULL,"
+                        " changed_at = CASE WHEN :event IS NULL THEN changed_at ELSE :now END"
+                        " WHERE jobvite_id = :jobvite_id",
+                        dict(current, position=position, event=event, now=now, jobvite_id=job["jobviteId"]),
+                    )
+
+            self._insert(new_jobs, now)
+            counts["opened"] = len(new_jobs)
+            changed_ids.update(job["jobviteId"] for job in new_jobs)
+
+            if jobs:
+                listed = {job["jobviteId"] for job in jobs}
+                closed = [row for jobvite_id, row in existing.items()
+                          if row["closed_at"] is None and jobvite_id not in listed]
+                self.db.executemany("UPDATE jobs SET closed_at = ?, changed_at = ? WHERE jobvite_id = ?",
+                                    [(now, now, row["jobvite_id"]) for row in closed])
+                for row in closed:
+                    self._log(row["jobvite_id"], now, "closed", row)
+                counts["closed"] = len(closed)
+                self.db.execute("UPDATE jobs SET last_seen = ? WHERE closed_at IS NULL", (now,))
+
+        return counts, changed_ids
+
+    def _insert(self, jobs, now):
+        rows = [dict(_to_row(job), jobvite_id=job["jobviteId"], position=job.get("position", position), now=now)
+                for position, job in enumerate(jobs)]
+        self.db.executemany(
+            "INSERT OR REPLACE INTO jobs (jobvite_id, title, sector, work_mode, country, description_hashes,"
+            " fetched_at, position, first_seen, last_seen, changed_at)"
+            " VALUES (:jobvite_id, :title, :sector, :work_mode, :country, :description_hashes,"
+            " :fetched_at, :position, :now, :now, :now)",
+            rows,
+        )
+        for row in rows:
+            self._log(row["jobvite_id"], now, "opened", row)
+
+    def _log(self, jobvite_id, at, event, row):
+        self.db.execute("INSERT INTO job_events (jobvite_id, at, event, title, description_hashes)"
+                        " VALUES (?, ?, ?, ?, ?)", (jobvite_id, at, event, row["title"], row["description_hashes"]))
+
+    def changes_since(self, since) -> list:
+        rows = self.db.execute("SELECT * FROM job_events WHERE at >= ? ORDER BY at, rowid", (int(since),))
+        return [dict(row) for row in rows]
+
+    def history(self, jobvite_id) -> dict:
+        """A job's current row plus its events, oldest first; None if it was never listed"""
+        row = self.db.execute("SELECT * FROM jobs WHERE jobvite_id = ?", (jobvite_id,)).fetchone()
+        if row is None:
+            return None
+        events = self.db.execute("SELECT * FROM job_events WHERE jobvite_id = ? ORDER BY at, rowid", (jobvite_id,))
+        return dict(dict(row), events=[dict(event) for event in events])
+
+def open_job_store(out_dir="") -> JobStore:
+    """The board's store, seeded from its jobs.json the first time"""
+    store = JobStore(os.path.join(out_dir, JOBS_DB))
+    if store.is_empty():
+        store.import_json(os.path.join(out_dir, 'jobs.json'))
+    return store
+
+def _format_time(timestamp) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else "-"
+
+def _parse_since(value) -> float:
+    """'24h', '7d', '30m' ago, or an absolute 'YYYY-MM-DD[ HH:MM]'"""
+    unit = value[-1:].lower()
+    if unit in INTERVAL_UNITS and value[:-1].isdigit():
+        return time.time() - int(value[:-1]) * INTERVAL_UNITS[unit]
+    return datetime.fromisoformat(value).timestamp()
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the job history of a board")
+    parser.add_argument("--board", default=os.getenv('DATA_DIR', ''),
+                        help="Board directory holding jobs.db (default: DATA_DIR or the current directory)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    changes = commands.add_parser("changes", help="Jobs opened, changed, closed or reopened since a time")
+    changes.add_argument("--since", default="24h", help="'24h', '7d' or 'YYYY-MM-DD[ HH:MM]' (default: 24h)")
+    history = commands.add_parser("history", help="Timeline of one job")
+    history.add_argument("jobvite_id")
+    args = parser.parse_args()
+
+    path = os.path.join(args.board, JOBS_DB)
+    if not os.path.exists(path):
+        parser.error(f"{path} does not exist; run a sync first")
+    store = JobStore(path)
+    try:
+        if args.command == "changes":
+            events = store.changes_since(_parse_since(args.since))
+            for event in events:
+                print(f"{_format_time(event['at'])}  {event['event']:<9} {event['jobvite_id']}  {event['title']}")
+            print(f"{len(events)} changes")
+        else:
+            job = store.history(args.jobvite_id)
+            if job is None:
+                parser.error(f"unknown job {args.jobvite_id}")
+            print(f"{job['jobvite_id']}  {job['title']}")
+            print(f"  first seen {_format_time(job['first_seen'])}, last seen {_format_time(job['last_seen'])}, "
+                  f"closed {_format_time(job['closed_at'])}")
+            for event in job["events"]:
+                print(f"  {_format_time(event['at'])}  {event['event']:<9} {event['title']}  "
+                      f"{', '.join(json.loads(event['description_hashes']))}")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+import json
+import time
+
+# One per board directory, removed once the run's index has been written
+JOURNAL_FILE = "crawl-journal.jsonl"
+
+# Fields carried from the journal into jobs.json, with the value a job gets when it has none
+JOB_FIELDS = {"sector": "", "workMode": "", "country": "", "descriptionHashes": [], "fetchedAt": None}
+
+class CrawlJournal:
+    """Append-only JSONL log of a board sync, one line per fetched or failed job
+
+    Each line is flushed and fsynced before the next job is handled, so a run that
+    dies halfway (driver crash, OOM, service restart) leaves a record of every job
+    it completed. The next run resumes from it, and jobs.json is compacted from it.
+    Jobs reused from the job store need no checkpoint and are never written here.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def resume(self, max_age_seconds) -> dict:
+        """Job records of an interrupted run younger than max_age_seconds, keyed by jobviteId"""
+        started = None
+        records = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line from a crash mid-write
+                    if record.get("type") == "start":
+                        started = record["at"]
+                    elif record.get("type") == "job":
+                        if record.get("error"):
+                            records.pop(record["jobviteId"], None)  # Failed jobs are fetched again
+                        else:
+                            records[record["jobviteId"]] = record
+        except OSError:
+            return {}
+
+        if started is None or time.time() - started > max_age_seconds:
+            return {}
+        return records
+
+    def start(self, resuming=False):
+        """Begin a run: append to an interrupted run's journal, or replace an old one"""
+        self.file = open(self.path, 'a' if resuming else 'w', encoding='utf-8')
+        if resuming:
+            self.file.write("\n")  # Never glue the first new line onto a torn one
+        self._append({"type": "resume" if resuming else "start", "at": time.time()})
+
+    def record(self, job, meta, status, error=None):
+        entry = {"type": "job", "jobviteId": job["jobviteId"], "jobTitle": job["jobTitle"], "status": status}
+        for field, default in JOB_FIELDS.items():
+            entry[field] = meta.get(field, default) if meta else default
+        if error:
+            entry["error"] = error
+        self._append(entry)
+
+    def _append(self, entry):
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def compact(self, jobs, cached=None) -> list:
+        """Fold the journal into the final job list, in the order of `jobs`
+
+        `cached` maps the jobviteId of each job reused without a journal line to its stored record.
+        """
+        self.close()
+        latest = {}
+        wanted = {job["jobviteId"] for job in jobs}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("type") == "job" and record["jobviteId"] in wanted:
+                    latest[record["jobviteId"]] = {field: record.get(field, default)
+                                                   for field, default in JOB_FIELDS.items()}
+        for jobvite_id, record in (cached or {}).items():
+            latest.setdefault(jobvite_id, {field: record.get(field, default)
+                                           for field, default in JOB_FIELDS.items()})
+
+        return [dict(job, **latest.get(job["jobviteId"], JOB_FIELDS)) for job in jobs]
+
+    def finish(self):
+        """The index now holds everything; the next run starts a fresh journal"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
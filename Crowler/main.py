@@ -1,57 +1,103 @@
 #!/usr/bin/env python3
 """
-Crowler Service Script with Hourly Logging
-This script runs the crowler service with automatic hourly logging
+Crowler command line: the scheduled service plus one-off commands.
+
+Usage:
+  python3 main.py                         # Run as service: scheduled syncs and the local API
+  python3 main.py install|start|stop|uninstall
+  python3 main.py trigger                 # Start a sync in the running service now
+  python3 main.py crawl [--offline DIR]   # Sync once, or rebuild jobs.json from a recorder.py snapshot
+  python3 main.py publish [--no-upload]   # Re-export jobs.json from jobs.db and upload it
 """
 
 import os
 import sys
+import json
 import time
 import logging
-import threading
+import argparse
 from datetime import datetime
-from crowler import sync_jobs, upload_jobs_to_ftp
-from service_manager import manage_service
-
-# Configure logging
-log_dir = "logs"
-os.makedirs(log_dir, exist_ok=True)
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f'{log_dir}/crowler.log'),
-        logging.StreamHandler()
-    ]
-)
-
-def six_hours_logger():
-    """Log a message every six hours while the service is running"""
-    while True:
-        logging.info(f"Crowler service is running - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        run_crowler_job()
-        
-        hours_delay = int(os.getenv('HOURS_DELAY'))
-        time.sleep(hours_delay * 3600)
+from dotenv import load_dotenv
+
+# Heavy modules (crowler, ftptransfer, the API) are imported by the commands that use them,
+# so install/start/stop/uninstall and trigger start in milliseconds; Selenium is only loaded
+# once crowler actually starts a browser
+
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+
+def setup_logging():
+    """Log to logs/crowler.log and the console"""
+    log_dir = "logs"
+    os.makedirs(log_dir, exist_ok=True)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(f'{log_dir}/crowler.log'),
+            logging.StreamHandler()
+        ]
+    )
 
-def run_crowler_job():
-    """Run the main crowler job"""
+def run_crowler_job(phases=None):
+    """Run the main crowler job and return the phases that failed and still need to run"""
+    from crowler import sync_jobs
+    from ftptransfer import upload_jobs_to_ftp
+    from scheduler import FULL_RUN
+    import metrics
+
+    phases = phases or FULL_RUN
+    logging.info(f"Crowler service is running - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    run = metrics.start_run()
+    phase = None
     try:
         logging.info("Starting crowler job...")
-        sync_jobs()
-        upload_jobs_to_ftp()
+        if "sync" in phases:
+            phase = "sync"
+            with run.span("sync"):
+                sync_jobs()
+        if "upload" in phases:
+            # Also the only phase retried after an upload-only failure: the synced files are still on disk
+            phase = "upload"
+            with run.span("upload"):
+                upload_jobs_to_ftp()
         logging.info("Crowler job completed successfully")
+        return ()
     except Exception as e:
-        logging.error(f"Error in crowler job: {e}")
+        run.error("run", str(e))
+        logging.error(f"Error in crowler job ({phase}): {e}")
+        return FULL_RUN if phase == "sync" else ("upload",)
+    finally:
+        phases = ", ".join(f"{phase} {entry['seconds']:.1f}s" for phase, entry in run.to_summary()["phases"].items())
+        logging.info(f"Crowler job phases: {phases}")
+        metrics.write_run_reports(run)
     
 def main():
-    """Main service function with hourly logging"""
+    """Main service function: scheduled runs plus the local jobs API and /sync trigger"""
+    import threading
+    from scheduler import get_scheduler
+    from apiserver import start_api_server
+
+    setup_logging()
     logging.info("Crowler service started")
+    api = None
+    
+    def run_and_reload(phases):
+        remaining = run_crowler_job(phases)
+        # Boards that synced before a failure were still exported, so reload either way
+        if api is not None and "sync" in phases:
+            api.reload()
+        return remaining
+    
+    scheduler = get_scheduler(run_and_reload)
+    try:
+        api = start_api_server(scheduler)
+    except OSError as e:
+        logging.error(f"API not available: {e}")
     
-    # Start the hourly logging in a separate thread
-    logging_thread = threading.Thread(target=six_hours_logger, daemon=True)
-    logging_thread.start()
+    # Run the scheduler in a separate thread
+    scheduler_thread = threading.Thread(target=scheduler.run_forever, daemon=True)
+    scheduler_thread.start()
     
     try:
         while True:
@@ -61,46 +107,133 @@ def main():
     except Exception as e:
         logging.error(f"Unexpected error in service: {e}")
         
-service_name = os.getenv('SERVICE_NAME')
-
 def install_service():
     """Install the crowler service using service_manager"""
+    from service_manager import manage_service
     app_path = os.path.abspath(__file__)
-    manage_service(service_name, "install", app_path)
+    manage_service(os.getenv('SERVICE_NAME'), "install", app_path)
     
 def start_service():
     """Start the crowler service using service_manager"""
-    manage_service(service_name, "start")
+    from service_manager import manage_service
+    manage_service(os.getenv('SERVICE_NAME'), "start")
     
 def stop_service():
     """Stop the crowler service using service_manager"""
-    manage_service(service_name, "stop")
+    from service_manager import manage_service
+    manage_service(os.getenv('SERVICE_NAME'), "stop")
     
 def uninstall_service():
     """Uninstall the crowler service using service_manager"""
-    manage_service(service_name, "uninstall")
+    from service_manager import manage_service
+    manage_service(os.getenv('SERVICE_NAME'), "uninstall")
+
+def trigger_sync():
+    """Ask the running service to start a sync now"""
+    from apiclient import request_sync
+    print(json.dumps(request_sync(), indent=2))
+
+def crawl(offline_dir=None, out_dir=None):
+    """Sync every board once; with offline_dir, reparse a recorded snapshot instead"""
+    setup_logging()
+    if not offline_dir:
+        from crowler import sync_jobs
+        return sync_jobs()
+
+    # Saved pages need no politeness delay, and nothing is cached from a previous run
+    os.environ["CRAWL_HOST_RATE"] = "0"
+    from crowler import sync_jobs
+    from recorder import SnapshotSession
+    session = SnapshotSession(offline_dir)
+    board = {"slug": "offline", "baseUrl": session.base_url, "outDir": out_dir or ".", "remoteDir": ""}
+    os.makedirs(board["outDir"], exist_ok=True)
+    started = time.perf_counter()
+    errors = sync_jobs(engine="offline", session=session, boards=[board], incremental=False)
+    print(f"Rebuilt {os.path.join(board['outDir'], 'jobs.json')} from {offline_dir} "
+          f"in {time.perf_counter() - started:.1f}s")
+    return errors
+
+def publish(upload=True) -> list:
+    """Re-export jobs.json, shards and search index from each board's job store, then upload them
+
+    Only boards that were exported are uploaded: one without a jobs.db keeps what the server has.
+    Returns the exported slugs.
+    """
+    from boards import get_boards
+    from blobstore import BlobStore, BLOBS_DIR
+    from jobstore import JobStore, JOBS_DB
+    from indexbuilder import export_jobs
+
+    exported = []
+    for board in get_boards():
+        path = os.path.join(board["outDir"], JOBS_DB)
+        if not os.path.exists(path):
+            print(f"Skipping board {board['slug']}: {path} does not exist; run a sync first")
+            continue
+        store = JobStore(path)
+        try:
+            jobs = store.open_jobs()
+            export_jobs(board["outDir"], jobs, BlobStore(os.path.join(board["outDir"], BLOBS_DIR)),
+                        store.last_synced())
+        finally:
+            store.close()
+        print(f"Exported {len(jobs)} jobs for board {board['slug']}")
+        exported.append(board["slug"])
+
+    if not exported:
+        raise RuntimeError("no board has a jobs.db to publish; run a sync first")
+    if upload:
+        from ftptransfer import upload_jobs_to_ftp
+        upload_jobs_to_ftp(exported)
+    return exported
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Crowler: sync Jobvite boards and publish them to FTP")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.add_parser("serve", help="Run as service: scheduled syncs and the local API (default)")
+    commands.add_parser("install", help="Install service")
+    commands.add_parser("start", help="Start service")
+    commands.add_parser("stop", help="Stop service")
+    commands.add_parser("uninstall", help="Uninstall service")
+    commands.add_parser("trigger", help="Start a sync in the running service now")
+    crawl_parser = commands.add_parser("crawl", help="Sync every board once, without uploading")
+    crawl_parser.add_argument("--offline", metavar="DIR",
+                              help="Rebuild jobs.json by reparsing a recorder.py snapshot: no browser, no network")
+    crawl_parser.add_argument("--out", metavar="DIR", help="Where --offline writes the board (default: current directory)")
+    publish_parser = commands.add_parser("publish", help="Re-export jobs.json from the job stores and upload it")
+    publish_parser.add_argument("--no-upload", action="store_true", help="Only rewrite the exported files")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    # Se não há argumentos, executa como serviço
-    if len(sys.argv) == 1:
+    # Load environment variables from the .env file next to this script, e.g. SERVICE_NAME
+    load_dotenv(ENV_FILE)
+    args = parse_args()
+    # Sem subcomando, executa como serviço
+    if args.command in (None, "serve"):
         main()
-    # Se há argumentos, executa comandos de gerenciamento
-    else:
-        action = sys.argv[1]
-        if action == "install":
-            install_service()
-        elif action == "start":
-            start_service()
-        elif action == "stop":
-            stop_service()
-        elif action == "uninstall":
-            uninstall_service()
-        else:
-            print("Invalid action. Available actions: install, start, stop, uninstall")
-            print("Usage:")
-            print("  python3 main.py          # Run as service")
-            print("  python3 main.py install  # Install service")
-            print("  python3 main.py start    # Start service")
-            print("  python3 main.py stop     # Stop service")
-            print("  python3 main.py uninstall # Uninstall service")
+    elif args.command == "install":
+        install_service()
+    elif args.command == "start":
+        start_service()
+    elif args.command == "stop":
+        stop_service()
+    elif args.command == "uninstall":
+        uninstall_service()
+    elif args.command == "trigger":
+        try:
+            trigger_sync()
+        except (OSError, RuntimeError) as e:
+            print(f"Trigger failed: {e} (is the service running?)")
+            sys.exit(1)
+    elif args.command == "crawl":
+        try:
+            crawl(args.offline, args.out)
+        except Exception as e:
+            print(f"Crawl failed: {e}")
+            sys.exit(1)
+    elif args.command == "publish":
+        try:
+            publish(upload=not args.no_upload)
+        except Exception as e:
+            print(f"Publish failed: {e}")
             sys.exit(1)
@@ -0,0 +1,90 @@
+import os
+import gc
+import time
+import threading
+import metrics
+from driverpool import process_tree_rss_mb
+
+# Below this share of the budget, shed browsers are allowed back one per sample
+RECOVERY_RATIO = 0.8
+
+# Restarted browsers need a moment to show up in the samples before shedding again
+SHED_COOLDOWN_SECONDS = 10
+
+def process_rss_mb() -> float:
+    """Resident memory of this Python process alone in MB (Linux /proc only)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+class MemoryWatchdog:
+    """Sample the RSS of the crawler and its browsers during a run and keep it under a budget
+
+    The process tree covers Python, chromedriver and every Chromium process. Above
+    `budget_mb` the browser pool is shed: browsers restart and fewer run at once
+    until memory falls back under RECOVERY_RATIO of the budget. A budget of 0 only
+    records the peak.
+    """
+
+    def __init__(self, pool=None, budget_mb=0, interval=1.0):
+        self.pool = pool
+        self.budget_mb = budget_mb
+        self.interval = interval
+        self.peak_mb = 0.0
+        self.peak_python_mb = 0.0
+        self.peak_browsers_mb = 0.0
+        self.sheds = 0
+        self.next_shed = 0.0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> float:
+        total = process_tree_rss_mb(os.getpid())
+        python = process_rss_mb()
+        self.peak_mb = max(self.peak_mb, total)
+        self.peak_python_mb = max(self.peak_python_mb, python)
+        self.peak_browsers_mb = max(self.peak_browsers_mb, total - python)
+        metrics.current.peak("peak_rss_mb", total, process="total")
+        metrics.current.peak("peak_rss_mb", python, process="python")
+        metrics.current.peak("peak_rss_mb", max(0.0, total - python), process="browsers")
+
+        if self.budget_mb and total > self.budget_mb:
+            if time.monotonic() < self.next_shed:
+                return total
+            print(f"Memory {total:.0f} MB above the {self.budget_mb} MB budget")
+            metrics.current.inc("memory_budget_exceeded_total")
+            self.sheds += 1
+            self.next_shed = time.monotonic() + SHED_COOLDOWN_SECONDS
+            gc.collect()
+            if self.pool is not None:
+                self.pool.shed()
+        elif self.budget_mb and total < self.budget_mb * RECOVERY_RATIO and self.pool is not None:
+            self.pool.restore()
+        return total
+
+    def __enter__(self):
+        self.sample()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+        self.sample()
+        print(f"Peak memory: {self.peak_mb:.0f} MB "
+              f"(Python {self.peak_python_mb:.0f} MB, browsers {max(0.0, self.peak_browsers_mb):.0f} MB)"
+              + (f", budget {self.budget_mb} MB exceeded {self.sheds} times" if self.budget_mb else ""))
+
+def get_memory_watchdog(pool=None) -> MemoryWatchdog:
+    """Watchdog configured from MEMORY_BUDGET_MB and MEMORY_SAMPLE_SECONDS"""
+    return MemoryWatchdog(
+        pool,
+        budget_mb=int(os.getenv('MEMORY_BUDGET_MB', '0')),
+        interval=float(os.getenv('MEMORY_SAMPLE_SECONDS', '1')),
+    )
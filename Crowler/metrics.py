@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# Upper bounds in seconds; Jobvite pages usually land between 0.1s and a few seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PREFIX = "crowler_"
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+def _summary_key(key, default):
+    return ",".join(f"{name}={value}" for name, value in key) or default
+
+class RunMetrics:
+    """Counters, latency histograms, phase spans and errors of one crawl/upload run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.phases = {}
+        self.errors = []
+
+    def inc(self, name, value=1, **labels):
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def peak(self, name, value, **labels):
+        """Keep the highest value seen for gauge `name`"""
+        with self.lock:
+            series = self.gauges.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = max(series.get(key, value), value)
+
+    def observe(self, name, seconds, **labels):
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            key = _label_key(labels)
+            histogram = series.setdefault(key, {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe how long the block takes in histogram `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def span(self, phase):
+        """Time one phase of the run (driver startup, job list, details, upload...)"""
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            with self.lock:
+                entry = self.phases.setdefault(phase, {"seconds": 0.0, "count": 0, "status": "ok"})
+                entry["seconds"] += time.perf_counter() - start
+                entry["count"] += 1
+                if status == "error":
+                    entry["status"] = "error"
+
+    def error(self, phase, message, **context):
+        with self.lock:
+            self.errors.append(dict(context, phase=phase, error=message))
+        self.inc("errors_total", phase=phase)
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self.lock:
+            duration = time.perf_counter() - self.start
+            lines.append(f"# TYPE {PREFIX}run_duration_seconds gauge")
+            lines.append(f"{PREFIX}run_duration_seconds {duration:.6f}")
+            lines.append(f"# TYPE {PREFIX}run_timestamp_seconds gauge")
+            lines.append(f"{PREFIX}run_timestamp_seconds {self.started_at.timestamp():.0f}")
+
+            lines.append(f"# TYPE {PREFIX}phase_duration_seconds gauge")
+            for phase, entry in self.phases.items():
+                lines.append(f'{PREFIX}phase_duration_seconds{{phase="{phase}"}} {entry["seconds"]:.6f}')
+            lines.append(f"# TYPE {PREFIX}phase_success gauge")
+            for phase, entry in self.phases.items():
+                lines.append(f'{PREFIX}phase_success{{phase="{phase}"}} {int(entry["status"] == "ok")}')
+
+            for name, series in self.counters.items():
+                lines.append(f"# TYPE {PREFIX}{name} counter")
+                for key, value in series.items():
+                    lines.append(f"{PREFIX}{name}{_format_labels(key)} {value}")
+
+            for name, series in self.gauges.items():
+                lines.append(f"# TYPE {PREFIX}{name} gauge")
+                for key, value in series.items():
+                    lines.append(f"{PREFIX}{name}{_format_labels(key)} {value:.1f}")
+
+            for name, series in self.histograms.items():
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                for key, histogram in series.items():
+                    for bound, count in zip(LATENCY_BUCKETS, histogram["buckets"]):
+                        lines.append(f"{PREFIX}{name}_bucket{_format_labels(key, [('le', bound)])} {count}")
+                    lines.append(f"{PREFIX}{name}_bucket{_format_labels(key, [('le', '+Inf')])} {histogram['count']}")
+                    lines.append(f"{PREFIX}{name}_sum{_format_labels(key)} {histogram['sum']:.6f}")
+                    lines.append(f"{PREFIX}{name}_count{_format_labels(key)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def to_summary(self) -> dict:
+        with self.lock:
+            return {
+                "startedAt": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "durationSeconds": round(time.perf_counter() - self.start, 3),
+                "phases": {phase: dict(entry, seconds=round(entry["seconds"], 3))
+                           for phase, entry in self.phases.items()},
+                "counters": {name: {_summary_key(key, "total"): value for key, value in series.items()}
+                             for name, series in self.counters.items()},
+                "gauges": {name: {_summary_key(key, "value"): round(value, 1) for key, value in series.items()}
+                           for name, series in self.gauges.items()},
+                "latency": {name: {_summary_key(key, "all"): {
+                                "count": histogram["count"],
+                                "avgSeconds": round(histogram["sum"] / histogram["count"], 3) if histogram["count"] else 0,
+                            } for key, histogram in series.items()}
+                            for name, series in self.histograms.items()},
+                "errors": list(self.errors),
+            }
+
+# The run in progress; crawler and uploader code records into it from any thread
+current = RunMetrics()
+
+def start_run() -> RunMetrics:
+    global current
+    current = RunMetrics()
+    return current
+
+def write_run_reports(run=None, metrics_dir=None):
+    """Write the Prometheus textfile and the JSON summary of a run"""
+    from atomicfile import write_atomic
+
+    run = run or current
+    metrics_dir = metrics_dir or os.getenv('METRICS_DIR', 'metrics')
+    os.makedirs(metrics_dir, exist_ok=True)
+
+    prometheus = run.to_prometheus()
+    summary = json.dumps(run.to_summary(), indent=2, ensure_ascii=False)
+    write_atomic(os.path.join(metrics_dir, "crowler.prom"), prometheus)
+    write_atomic(os.path.join(metrics_dir, "run-summary.json"), summary)
+    print(f"Run metrics written to {metrics_dir}/crowler.prom and {metrics_dir}/run-summary.json")
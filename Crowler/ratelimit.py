@@ -0,0 +1,67 @@
+import os
+import time
+import threading
+from urllib.parse import urlparse
+import metrics
+
+# Requests per second per host when CRAWL_HOST_RATE is unset: a few pages a second,
+# well under what a person clicking through the board would cause at CRAWL_CONCURRENCY
+DEFAULT_HOST_RATE = "2"
+
+class TokenBucket:
+    """Allow `rate` requests per second on average, with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until it is available; returns the seconds waited"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now and sleep outside the lock, so callers queue up fairly
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+class HostRateLimiter:
+    """One token bucket per host, shared by every board and worker in the process"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        if self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        waited = bucket.acquire()
+        if waited:
+            metrics.current.inc("rate_limit_wait_seconds_total", waited, host=host)
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter configured by CRAWL_HOST_RATE and CRAWL_HOST_BURST"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            # Requests per second per host, polite by default; 0 disables the limit
+            rate = float(os.getenv('CRAWL_HOST_RATE', DEFAULT_HOST_RATE))
+            burst = float(os.getenv('CRAWL_HOST_BURST', '5'))
+            _rate_limiter = HostRateLimiter(rate, burst)
+        return _rate_limiter
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Snapshot a Jobvite board (list pages, 'Show More' pages and job details) to disk
+so fixtureserver.py can replay it for offline benchmarks, or `main.py crawl --offline`
+can reparse it without a browser or network.
+
+Usage:
+  python3 recorder.py snapshots                 # Record JOBVITE_BASE_URL (or the default board)
+  python3 recorder.py snapshots --max-jobs 50   # Only keep the first 50 detail pages
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+from urllib.parse import urljoin, urlparse
+from atomicfile import write_atomic
+from httpcrawler import get_base_url, get_session, fetch_page
+from jobparser import parse_job_list
+
+# Index of a snapshot directory: request path -> file, plus what the board looked like
+SNAPSHOT_MANIFEST = "snapshots.json"
+
+def request_path(url) -> str:
+    """Path and query of a URL, the key a replayed page is served under"""
+    parsed = urlparse(url)
+    return parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+class SnapshotResponse:
+    """The parts of a urllib3 response fetch_page reads"""
+
+    def __init__(self, status, data=b""):
+        self.status = status
+        self.data = data
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
+
+class SnapshotSession:
+    """Stands in for the urllib3 session, answering GETs from a snapshot directory
+
+    Pages are looked up by path and query only, so links to the recorded origin
+    resolve too; anything that was not recorded is a 404.
+    """
+
+    def __init__(self, snapshots_dir):
+        self.snapshots_dir = snapshots_dir
+        with open(os.path.join(snapshots_dir, SNAPSHOT_MANIFEST), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+    @property
+    def base_url(self) -> str:
+        return self.manifest["baseUrl"]
+
+    def request(self, method, url, **kwargs) -> SnapshotResponse:
+        file = self.manifest["pages"].get(request_path(url))
+        if method != "GET" or not file:
+            return SnapshotResponse(404)
+        with open(os.path.join(self.snapshots_dir, file), 'rb') as f:
+            return SnapshotResponse(200, f.read())
+
+    def clear(self):
+        pass
+
+def record_board(out_dir, base_url=None, max_jobs=None) -> dict:
+    """Save every list page and up to max_jobs detail pages of a board under out_dir"""
+    base_url = base_url or get_base_url()
+    os.makedirs(os.path.join(out_dir, "job"), exist_ok=True)
+    session = get_session(pool_size=1)
+    parsed = urlparse(base_url)
+    manifest = {
+        "baseUrl": base_url,
+        # Absolute links in the pages point here; the fixture server rewrites them to itself
+        "origin": f"{parsed.scheme}://{parsed.netloc}",
+        "boardPath": parsed.path,
+        "recordedAt": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "listPages": [],
+        "detailPages": [],
+        "pages": {},
+    }
+
+    def save(url, file, html):
+        write_atomic(os.path.join(out_dir, file), html)
+        manifest["pages"][request_path(url)] = file
+
+    # Same walk as get_jobs_http, keeping the raw markup of each page
+    jobs = []
+    known_ids = set()
+    pending = [base_url]
+    visited = set()
+    while pending:
+        url = pending.pop(0)
+        if url in visited:
+            continue
+        visited.add(url)
+
+        html = fetch_page(session, url)
+        file = f"list-{len(manifest['listPages']) + 1}.html"
+        save(url, file, html)
+        manifest["listPages"].append(file)
+
+        page_jobs, show_more_links = parse_job_list(html)
+        new_jobs = [job for job in page_jobs if job["jobviteId"] not in known_ids]
+        print(f"Recorded {url}: {len(new_jobs)} new jobs")
+        if new_jobs:
+            jobs.extend(new_jobs)
+            known_ids.update(job["jobviteId"] for job in new_jobs)
+            pending.extend(urljoin(url, href) for href in show_more_links)
+
+    for job in jobs[:max_jobs]:
+        url = urljoin(base_url, f"job/{job['jobviteId']}")
+        try:
+            html = fetch_page(session, url)
+        except Exception as e:
+            print(f"Error recording {url}: {e}")
+            continue
+        file = f"job/{job['jobviteId']}.html"
+        save(url, file, html)
+        manifest["detailPages"].append(file)
+
+    manifest["jobs"] = len(jobs)
+    write_atomic(os.path.join(out_dir, SNAPSHOT_MANIFEST), json.dumps(manifest, indent=2, ensure_ascii=False))
+    print(f"Recorded {len(manifest['listPages'])} list pages and "
+          f"{len(manifest['detailPages'])} of {len(jobs)} job pages to {out_dir}")
+    session.clear()
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot a Jobvite board for offline benchmarks")
+    parser.add_argument("out_dir", help="Directory to write the snapshots to")
+    parser.add_argument("--base-url", help="Board URL (default: JOBVITE_BASE_URL or the leantechio board)")
+    parser.add_argument("--max-jobs", type=int, help="Record at most this many detail pages")
+    args = parser.parse_args()
+
+    try:
+        record_board(args.out_dir, args.base_url, args.max_jobs)
+    except Exception as e:
+        print(f"Recording failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import os
+import re
+import random
+import logging
+import threading
+from datetime import datetime, timedelta
+
+FULL_RUN = ("sync", "upload")
+
+# Ceiling for the exponential retry delay
+MAX_BACKOFF_SECONDS = 3600
+
+CRON_FIELDS = [("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7)]
+
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+class FixedRateSchedule:
+    """Runs every `interval` seconds, measured from start to start so crawl time never adds drift"""
+
+    def __init__(self, interval_seconds):
+        if interval_seconds <= 0:
+            raise ValueError("schedule interval must be positive")
+        self.interval = timedelta(seconds=interval_seconds)
+
+    def next_after(self, previous, now) -> datetime:
+        next_time = previous + self.interval
+        if next_time <= now:
+            # Slots missed while a run overran are skipped, not run back to back
+            missed = (now - next_time) // self.interval + 1
+            next_time += self.interval * missed
+        return next_time
+
+    def __str__(self):
+        return f"every {self.interval}"
+
+class CronSchedule:
+    """Five-field cron expression (minute hour day month weekday) in local time"""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        values = [_parse_cron_field(field, low, high) for field, (_, low, high) in zip(fields, CRON_FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = values
+        self.weekdays = {weekday % 7 for weekday in weekdays}  # 0 and 7 are both Sunday
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        # Like cron: when both day fields are restricted, either one may match
+        if not self.any_day and not self.any_weekday:
+            return day or weekday
+        return day and weekday
+
+    def next_after(self, previous, now) -> datetime:
+        moment = max(previous, now).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment.year + 5
+        while moment.year <= limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"cron expression never matches: {self.expression!r}")
+
+    def __str__(self):
+        return f"cron '{self.expression}'"
+
+def _parse_cron_field(field, low, high) -> set:
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/", 1)
+            step = int(step)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step != 1 else start  # "5/15" means from 5 to the end in steps of 15
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"invalid cron field {field!r} (allowed {low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+def parse_schedule(spec):
+    """'6h', 'every 30m', '3600s' or a five-field cron expression"""
+    spec = spec.strip()
+    match = re.fullmatch(r"(?:every\s+)?(\d+(?:\.\d+)?)\s*([smhd])", spec, re.IGNORECASE)
+    if match:
+        return FixedRateSchedule(float(match.group(1)) * INTERVAL_UNITS[match.group(2).lower()])
+    return CronSchedule(spec)
+
+def get_schedule():
+    """SYNC_SCHEDULE, falling back to the legacy HOURS_DELAY interval"""
+    spec = os.getenv('SYNC_SCHEDULE')
+    if spec:
+        return parse_schedule(spec)
+    return FixedRateSchedule(float(os.getenv('HOURS_DELAY') or '24') * 3600)
+
+class SyncScheduler:
+    """Run the crowler job on a schedule, never two at once, with retries and on-demand triggers
+
+    `job(phases)` runs the given phases ("sync", "upload") and returns the phases that
+    still need to run: all of them after a failed sync, only "upload" after a failed upload.
+    """
+
+    def __init__(self, job, schedule, jitter_seconds=0.0, retries=3, backoff_seconds=60.0, run_on_start=True):
+        self.job = job
+        self.schedule = schedule
+        self.jitter_seconds = jitter_seconds
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.run_on_start = run_on_start
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.requested = None
+        self.running = None
+        self.retry_at = None
+        self.retry_phases = None
+        self.attempt = 0
+        self.next_nominal = None
+        self.next_run = None
+        self.last_run = None
+
+    def _jittered(self, moment):
+        return moment + timedelta(seconds=random.uniform(0, self.jitter_seconds))
+
+    def trigger(self, reason="manual") -> dict:
+        """Ask for a full run now; a request made during a run starts right after it"""
+        with self.lock:
+            queued = self.requested is not None
+            self.requested = reason
+        self.wake.set()
+        status = self.status()
+        if queued:
+            status["accepted"] = "already queued"
+        else:
+            status["accepted"] = "queued after current run" if status["running"] else "starting"
+        return status
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                "running": self.running,
+                "queued": self.requested,
+                "schedule": str(self.schedule),
+                "nextRun": self.next_run.strftime("%Y-%m-%d %H:%M:%S") if self.next_run else None,
+                "retryAt": self.retry_at.strftime("%Y-%m-%d %H:%M:%S") if self.retry_at else None,
+                "retryPhases": list(self.retry_phases) if self.retry_phases else None,
+                "lastRun": dict(self.last_run) if self.last_run else None,
+            }
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+
+    def run_forever(self):
+        now = datetime.now()
+        self.next_nominal = now if self.run_on_start else self.schedule.next_after(now, now)
+        self.next_run = now if self.run_on_start else self._jittered(self.next_nominal)
+        logging.info(f"Scheduler started ({self.schedule}), next run at {self.next_run:%Y-%m-%d %H:%M:%S}")
+
+        while not self.stopped.is_set():
+            due = min(self.next_run, self.retry_at) if self.retry_at else self.next_run
+            self.wake.wait(timeout=max(0.0, (due - datetime.now()).total_seconds()))
+            self.wake.clear()
+            if self.stopped.is_set():
+                break
+
+            now = datetime.now()
+            with self.lock:
+                requested, self.requested = self.requested, None
+            if requested:
+                if isinstance(self.schedule, FixedRateSchedule):
+                    # The triggered run takes the next slot, so no scheduled run follows right after it
+                    self.next_nominal = self.schedule.next_after(now, now)
+                    with self.lock:
+                        self.next_run = self._jittered(self.next_nominal)
+                self._execute(FULL_RUN, requested)
+            elif now >= self.next_run:
+                self.next_nominal = self.schedule.next_after(self.next_nominal, now)
+                with self.lock:
+                    self.next_run = self._jittered(self.next_nominal)
+                self._execute(FULL_RUN, "schedule")
+            elif self.retry_at and now >= self.retry_at:
+                self._execute(self.retry_phases, f"retry {self.attempt}", retry=True)
+
+    def _execute(self, phases, reason, retry=False):
+        if not retry:
+            # A new run supersedes any pending retry
+            self.attempt = 0
+        with self.lock:
+            self.running = reason
+            self.retry_at = self.retry_phases = None
+        started = datetime.now()
+        logging.info(f"Starting run ({reason}): {', '.join(phases)}")
+        try:
+            remaining = tuple(self.job(phases))
+        except Exception as e:
+            logging.error(f"Run failed unexpectedly: {e}")
+            remaining = tuple(phases)
+
+        with self.lock:
+            self.running = None
+            self.last_run = {
+                "reason": reason,
+                "phases": list(phases),
+                "startedAt": started.strftime("%Y-%m-%d %H:%M:%S"),
+                "seconds": round((datetime.now() - started).total_seconds(), 1),
+                "failedPhases": list(remaining),
+            }
+            if remaining and self.attempt < self.retries:
+                self.attempt += 1
+                delay = min(MAX_BACKOFF_SECONDS, self.backoff_seconds * 2 ** (self.attempt - 1))
+                self.retry_at = datetime.now() + timedelta(seconds=delay)
+                self.retry_phases = remaining
+                logging.warning(f"Retrying {', '.join(remaining)} in {delay:.0f}s "
+                                f"(attempt {self.attempt} of {self.retries})")
+            elif remaining:
+                logging.error(f"Giving up on {', '.join(remaining)} until the next scheduled run")
+        logging.info(f"Next scheduled run at {self.next_run:%Y-%m-%d %H:%M:%S}")
+
+def get_scheduler(job) -> SyncScheduler:
+    """Scheduler configured from SYNC_* environment variables"""
+    return SyncScheduler(
+        job,
+        get_schedule(),
+        jitter_seconds=float(os.getenv('SYNC_JITTER_SECONDS', '60')),
+        retries=int(os.getenv('SYNC_RETRIES', '3')),
+        backoff_seconds=float(os.getenv('SYNC_RETRY_BACKOFF_SECONDS', '60')),
+        run_on_start=os.getenv('SYNC_RUN_ON_START', 'true').lower() == 'true',
+    )
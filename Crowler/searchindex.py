@@ -0,0 +1,85 @@
+import re
+import unicodedata
+from html import unescape
+from html.parser import HTMLParser
+
+# Too common to narrow a search; everything else in titles, meta and descriptions is indexed
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "our", "the", "to", "we", "will", "with", "you", "your",
+    "de", "del", "el", "en", "la", "las", "los", "para", "por", "que", "un", "una", "y",
+}
+
+FACET_FIELDS = ["sector", "workMode", "country"]
+
+class _TextExtractor(HTMLParser):
+    """Collect the visible text of an HTML fragment"""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self.skip += 1
+        # Keep words in adjacent blocks apart: "<li>Python</li><li>SQL</li>"
+        self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self.skip:
+            self.skip -= 1
+        self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.parts.append(data)
+
+def html_to_text(html) -> str:
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return unescape(" ".join("".join(parser.parts).split()))
+
+def tokenize(text):
+    """Lowercase, accent-free word tokens; the Site tokenizes queries the same way"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [token for token in re.findall(r"\w+", text) if len(token) > 1 and token not in STOPWORDS]
+
+def build_search_index(jobs, store) -> dict:
+    """Inverted index from term to the positions of matching jobs in `ids`"""
+    postings = {}
+    # Fragments shared by many postings are only stripped once
+    fragment_text = {}
+    for position, job in enumerate(jobs):
+        text = " ".join([job.get("jobTitle", "")] + [job.get(field, "") for field in FACET_FIELDS])
+        for blob_hash in job.get("descriptionHashes", []):
+            if blob_hash not in fragment_text:
+                try:
+                    fragment_text[blob_hash] = html_to_text(store.get([blob_hash]))
+                except OSError:
+                    fragment_text[blob_hash] = ""  # Title and meta fields are still searchable
+            text += " " + fragment_text[blob_hash]
+
+        for term in set(tokenize(text)):
+            postings.setdefault(term, []).append(position)
+
+    return {
+        "ids": [job["jobviteId"] for job in jobs],
+        # Shipped with the index so the Site drops the same words from queries
+        "stopwords": sorted(STOPWORDS),
+        "terms": {term: postings[term] for term in sorted(postings)},
+    }
+
+def build_facets(jobs) -> dict:
+    """Number of jobs per sector, work mode and country, most common first"""
+    facets = {}
+    for field in FACET_FIELDS:
+        counts = {}
+        for job in jobs:
+            value = job.get(field, "")
+            if value:
+                counts[value] = counts.get(value, 0) + 1
+        facets[field] = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+    return facets
@@ -0,0 +1,56 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from blobstore import BlobStore, BLOBS_DIR
+from crowler import sync_jobs
+from fixtureserver import FixtureServer, synthetic_id
+from httpcrawler import get_session
+from jobstore import open_job_store
+from journal import CrawlJournal
+
+class SyncJobsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.server = FixtureServer(jobs=3).start()
+        self.addCleanup(self.server.close)
+        self.board = {"slug": "test", "baseUrl": self.server.base_url, "outDir": self.tmp.name, "remoteDir": ""}
+
+    def sync(self, incremental):
+        with redirect_stdout(io.StringIO()):
+            return sync_jobs("http", get_session(), [self.board], incremental)
+
+    def stored_hashes(self):
+        job_store = open_job_store(self.tmp.name)
+        try:
+            return {job["jobviteId"]: job["descriptionHashes"] for job in job_store.open_jobs()}
+        finally:
+            job_store.close()
+
+    def test_full_sync_keeps_the_last_good_description(self):
+        self.sync(incremental=False)
+        before = self.stored_hashes()
+        missing = synthetic_id(2)
+        detail_page = self.server._synthetic_detail_page
+        with mock.patch.object(self.server, "_synthetic_detail_page",
+                               lambda jobvite_id: None if jobvite_id == missing else detail_page(jobvite_id)):
+            errors = self.sync(incremental=False)
+        self.assertEqual([error["jobviteId"] for error in errors], [missing])
+        self.assertTrue(before[missing])
+        self.assertEqual(self.stored_hashes(), before)
+        store = BlobStore(os.path.join(self.tmp.name, BLOBS_DIR))
+        self.assertTrue(all(store.has(blob_hash) for blob_hash in before[missing]))
+
+    def test_unchanged_incremental_sync_journals_nothing(self):
+        self.sync(incremental=True)
+        with mock.patch.object(CrawlJournal, "_append", autospec=True, side_effect=CrawlJournal._append) as append:
+            self.sync(incremental=True)
+        # Only the run's start line is fsynced: the reused jobs are already in the job store
+        self.assertEqual([call.args[1]["type"] for call in append.call_args_list], ["start"])
+        self.assertEqual(len(self.stored_hashes()), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from driverpool import DriverPool
+from jobparser import MarkupError
+
+class FakeDriver:
+    command_count = 0
+
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return "about:blank"
+
+    def quit(self):
+        self.quit_called = True
+
+class DriverPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.started = []
+        self.pool = DriverPool(self.start, size=1)
+        self.addCleanup(self.pool.close)
+
+    def start(self):
+        self.started.append(FakeDriver())
+        return self.started[-1]
+
+    def fail_with(self, error, kill=False):
+        with self.assertRaises(type(error)):
+            with self.pool.driver() as driver:
+                if kill:
+                    driver.alive = False
+                raise error
+
+    def test_page_errors_keep_the_browser_warm(self):
+        self.fail_with(TimeoutException("no description"))
+        self.fail_with(MarkupError("no description"))
+        with self.pool.driver():
+            pass
+        self.assertEqual(len(self.started), 1)
+        self.assertFalse(self.started[0].quit_called)
+
+    def test_broken_session_is_retired(self):
+        self.fail_with(WebDriverException("invalid session id"))
+        self.assertTrue(self.started[0].quit_called)
+        with self.pool.driver():
+            pass
+        self.assertEqual(len(self.started), 2)
+
+    def test_dead_browser_is_retired(self):
+        self.fail_with(MarkupError("no description"), kill=True)
+        self.assertTrue(self.started[0].quit_called)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import io
+import os
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from ftplib import error_perm
+from unittest import mock
+import ftppool
+from ftptransfer import REMOTE_MANIFEST, files_to_delete, upload_board
+
+class FakeFtp:
+    """Just enough of ftplib.FTP for upload_board, backed by a dict of path -> bytes"""
+
+    def __init__(self, files):
+        self.files = dict(files)
+
+    def retrbinary(self, command, callback):
+        path = command.split(" ", 1)[1]
+        if path not in self.files:
+            raise error_perm("550 not found")
+        callback(self.files[path])
+
+    def nlst(self, directory):
+        return [path for path in self.files if path.startswith(directory + "/")]
+
+    def delete(self, path):
+        del self.files[path]
+
+class FakeUploader:
+    def __init__(self, ftp, failing=()):
+        self.control = ftp
+        self.failing = set(failing)
+
+    def ensure_dirs(self, remote_paths):
+        pass
+
+    def store(self, ftp, file, remote_path):
+        ftp.files[remote_path] = file.read()
+
+    def upload(self, files, ordered=False):
+        results = []
+        for local_path, remote_path in files:
+            ok = remote_path not in self.failing
+            if ok:
+                with open(local_path, 'rb') as file:
+                    self.store(self.control, file, remote_path)
+            results.append({"path": remote_path, "ok": ok, "attempts": 1, "bytes": 0, "error": None})
+        return results
+
+def published(paths):
+    """A server holding `paths` plus a manifest that lists them"""
+    files = {path: b"old" for path in paths}
+    files[REMOTE_MANIFEST] = json.dumps({"files": {path: "old" for path in paths}}).encode('utf-8')
+    return FakeFtp(files)
+
+def quietly(function, *args):
+    with redirect_stdout(io.StringIO()):
+        return function(*args)
+
+class FilesToDeleteTest(unittest.TestCase):
+    def test_dropped_files(self):
+        remote = {"jobs.json": "a", "jobs/x.json": "b", "blobs/0.html": "c"}
+        local = {"jobs.json": "a2", "jobs/y.json": "d"}
+        self.assertEqual(files_to_delete(local, remote), ["jobs/x.json", "blobs/0.html"])
+
+    def test_nothing_without_local_jobs_json(self):
+        self.assertEqual(quietly(files_to_delete, {}, {"jobs.json": "a", "jobs/x.json": "b"}), [])
+
+    def test_nothing_while_a_published_index_file_is_missing(self):
+        remote = {"jobs.json": "a", "search-index.json": "s", "jobs/x.json": "b"}
+        self.assertEqual(quietly(files_to_delete, {"jobs.json": "a2"}, remote), [])
+
+class UploadBoardTest(unittest.TestCase):
+    # Run from inside the board directory: upload_board mirrors out_dir as the remote prefix
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def write(self, path, content="{}"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_empty_directory_is_refused(self):
+        ftp = published(["jobs.json", "jobs/x.json", "blobs/0123456789abcdef0123.html"])
+        before = dict(ftp.files)
+        with self.assertRaises(FileNotFoundError):
+            quietly(upload_board, FakeUploader(ftp), "")
+        self.assertEqual(ftp.files, before)
+
+    def test_closed_job_is_deleted(self):
+        ftp = published(["jobs.json", "jobs/x.json", "jobs/y.json"])
+        self.write("jobs.json", '{"jobs": []}')
+        self.write("jobs/y.json")
+        quietly(upload_board, FakeUploader(ftp), "")
+        self.assertNotIn("jobs/x.json", ftp.files)
+        self.assertIn("jobs/y.json", ftp.files)
+        self.assertEqual(json.loads(ftp.files[REMOTE_MANIFEST])["files"].keys(), {"jobs.json", "jobs/y.json"})
+
+    def test_incomplete_index_deletes_nothing(self):
+        ftp = published(["jobs.json", "search-index.json", "jobs/x.json"])
+        self.write("jobs.json", '{"jobs": []}')
+        quietly(upload_board, FakeUploader(ftp), "")
+        self.assertIn("jobs/x.json", ftp.files)
+        self.assertIn("search-index.json", ftp.files)
+        # Still on the server, so still in the manifest for a later run to clean up
+        self.assertIn("jobs/x.json", json.loads(ftp.files[REMOTE_MANIFEST])["files"])
+
+    def test_failed_compressed_index_deletes_nothing(self):
+        ftp = published(["jobs.json", "jobs.json.gz", "jobs/x.json"])
+        self.write("jobs.json", '{"jobs": []}')
+        self.write("jobs.json.gz", "new")
+        quietly(upload_board, FakeUploader(ftp, failing={"jobs.json.gz"}), "")
+        # The old jobs.json.gz is still served and still points at jobs/x.json
+        self.assertEqual(ftp.files["jobs.json.gz"], b"old")
+        self.assertIn("jobs/x.json", ftp.files)
+        self.assertIn("jobs/x.json", json.loads(ftp.files[REMOTE_MANIFEST])["files"])
+
+class OrderedUploadTest(unittest.TestCase):
+    def test_stops_at_the_first_failure(self):
+        with mock.patch.object(ftppool, "connect"):
+            uploader = ftppool.FtpUploader({}, connections=1)
+        self.addCleanup(uploader.close)
+        sent = []
+
+        def upload_one(local_path, remote_path):
+            sent.append(remote_path)
+            return {"path": remote_path, "ok": remote_path != "jobs.json.gz"}
+
+        with mock.patch.object(uploader, "_upload_one", upload_one):
+            results = uploader.upload([("a", "jobs.json.br"), ("b", "jobs.json.gz"), ("c", "jobs.json")], ordered=True)
+        self.assertEqual(sent, ["jobs.json.br", "jobs.json.gz"])
+        self.assertEqual([result["ok"] for result in results], [True, False, False])
+
+if __name__ == "__main__":
+    unittest.main()
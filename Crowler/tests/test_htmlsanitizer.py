@@ -0,0 +1,35 @@
+import unittest
+from htmlsanitizer import DEFAULT_RULES, sanitize_description
+
+class SanitizeDescriptionTest(unittest.TestCase):
+    def assertSanitized(self, html, expected):
+        self.assertEqual(sanitize_description(html, DEFAULT_RULES), expected)
+
+    def test_styles_spans_and_whitespace(self):
+        self.assertSanitized('<div style="color:red">\n  <span style="x">Hello</span>   <b>world</b>\n</div>',
+                             "<p>Hello <b>world</b></p>")
+
+    def test_empty_elements_are_dropped(self):
+        self.assertSanitized("<p>&nbsp;</p><p><span></span></p><p>Text<br></p>", "<p>Text<br></p>")
+
+    def test_scripts_and_unsafe_links(self):
+        self.assertSanitized('<p>a<script>alert(1)</script><a href="java\tscript:x">b</a>'
+                             '<a href="https://x.example/?a=1&amp;b=2">c</a></p>',
+                             '<p>ab<a href="https://x.example/?a=1&amp;b=2">c</a></p>')
+
+    def test_sibling_list_items_close_each_other(self):
+        self.assertSanitized("<ul><li>a<li>b</ul>", "<ul><li>a</li><li>b</li></ul>")
+
+    def test_nested_list_items_stay_nested(self):
+        self.assertSanitized("<ul><li>a<ul><li>x<li>y</ul><li>b</ul>",
+                             "<ul><li>a<ul><li>x</li><li>y</li></ul></li><li>b</li></ul>")
+
+    def test_paragraphs_close_before_blocks(self):
+        self.assertSanitized("<p>one<p>two<ul><li>three</ul>", "<p>one</p><p>two</p><ul><li>three</li></ul>")
+
+    def test_ampersands(self):
+        self.assertSanitized("<p>R&D & co, a < b, &lt;tag&gt;, caf&eacute;</p>",
+                             "<p>R&amp;D &amp; co, a &lt; b, &lt;tag&gt;, caf&eacute;</p>")
+
+if __name__ == "__main__":
+    unittest.main()
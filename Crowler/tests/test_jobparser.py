@@ -0,0 +1,47 @@
+import unittest
+from jobparser import MarkupError, parse_job_detail, parse_job_list
+
+DETAIL_PAGE = """<html><body>
+<div class="jv-job-detail-meta">Engineering<span class="jv-inline-separator"></span>Remote, Brazil</div>
+<div class="jv-job-detail-description">{description}</div>
+<p>Footer</p>
+</body></html>"""
+
+class ParseJobDetailTest(unittest.TestCase):
+    def parse(self, description):
+        return parse_job_detail(DETAIL_PAGE.format(description=description))
+
+    def test_meta(self):
+        job = self.parse("<p>Hello</p>")
+        self.assertEqual((job["sector"], job["work_mode"], job["country"]), ("Engineering", "Remote", "Brazil"))
+
+    def test_unclosed_children_end_with_the_description(self):
+        job = self.parse("<p>First<p>Second <span>still open<ul><li>one<li>two")
+        self.assertEqual(job["description"], "<p>First</p><p>Second still open</p><ul><li>one</li><li>two</li></ul>")
+
+    def test_unknown_entity_names_stay_text(self):
+        job = self.parse("<p>R&D team &amp; AT&T, caf&eacute; &apos;24</p>")
+        self.assertEqual(job["description"], "<p>R&amp;D team &amp; AT&amp;T, caf&eacute; &apos;24</p>")
+
+    def test_missing_description(self):
+        with self.assertRaises(MarkupError):
+            parse_job_detail("<html><body><p>Nothing here</p></body></html>")
+
+class ParseJobListTest(unittest.TestCase):
+    def test_rows_and_show_more(self):
+        html = """
+        <table>
+          <tr><td class="jv-job-list-name"><a href="/acme/job/oAbc123?src=x">R&D Engineer</a></td></tr>
+          <tr><td class="jv-job-list-name"><a href="/acme/job/oDef456">Designer</td></tr>
+        </table>
+        <a href="/acme/?p=2">Show More</a>
+        """
+        jobs, show_more = parse_job_list(html)
+        self.assertEqual(jobs, [
+            {"jobviteId": "oAbc123", "jobTitle": "R&D Engineer"},
+            {"jobviteId": "oDef456", "jobTitle": "Designer"},
+        ])
+        self.assertEqual(show_more, ["/acme/?p=2"])
+
+if __name__ == "__main__":
+    unittest.main()
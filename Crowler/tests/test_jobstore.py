@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from jobstore import JobStore
+
+def job(jobvite_id, title="Engineer", hashes=("a",), fetched_at=1):
+    return {"jobviteId": jobvite_id, "jobTitle": title, "sector": "Tech", "workMode": "Remote",
+            "country": "Brazil", "descriptionHashes": list(hashes), "fetchedAt": fetched_at}
+
+class JobStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmp.name, "jobs.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_sync_diff(self):
+        counts, changed = self.store.record_sync([job("x"), job("y")], now=100)
+        self.assertEqual(counts, {"opened": 2, "changed": 0, "reopened": 0, "closed": 0})
+        self.assertEqual(changed, {"x", "y"})
+
+        # A refetch alone changes the record but is not an event; a new description is
+        counts, changed = self.store.record_sync([job("x", fetched_at=2), job("y", hashes=("b",))], now=200)
+        self.assertEqual(counts, {"opened": 0, "changed": 1, "reopened": 0, "closed": 0})
+        self.assertEqual(changed, {"x", "y"})
+
+        counts, changed = self.store.record_sync([job("y", hashes=("b",))], now=300)
+        self.assertEqual(counts["closed"], 1)
+        self.assertEqual(changed, set())
+        self.assertEqual([j["jobviteId"] for j in self.store.open_jobs()], ["y"])
+
+        counts, _ = self.store.record_sync([job("x", fetched_at=2), job("y", hashes=("b",))], now=400)
+        self.assertEqual(counts["reopened"], 1)
+
+    def test_empty_listing_closes_nothing(self):
+        self.store.record_sync([job("x")], now=100)
+        counts, _ = self.store.record_sync([], now=200)
+        self.assertEqual(counts["closed"], 0)
+        self.assertEqual(len(self.store.open_jobs()), 1)
+
+    def test_open_jobs_follow_board_order(self):
+        self.store.record_sync([job("x"), job("y")], now=100)
+        self.store.record_sync([job("y"), job("x")], now=200)
+        self.assertEqual([j["jobviteId"] for j in self.store.open_jobs()], ["y", "x"])
+
+    def test_history(self):
+        self.store.record_sync([job("x")], now=100)
+        self.store.record_sync([job("x", title="Senior Engineer")], now=200)
+        self.store.record_sync([job("y")], now=300)
+        history = self.store.history("x")
+        self.assertEqual([event["event"] for event in history["events"]], ["opened", "changed", "closed"])
+        self.assertEqual((history["first_seen"], history["closed_at"]), (100, 300))
+        self.assertEqual(len(self.store.changes_since(200)), 3)
+        self.assertIsNone(self.store.history("unknown"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest import mock
+import journal
+from journal import CrawlJournal
+
+def job(jobvite_id, title="Engineer"):
+    return {"jobviteId": jobvite_id, "jobTitle": title}
+
+def meta(hashes=("a",), fetched_at=1):
+    return {"sector": "Tech", "workMode": "Remote", "country": "Brazil",
+            "descriptionHashes": list(hashes), "fetchedAt": fetched_at}
+
+class CrawlJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, journal.JOURNAL_FILE)
+
+    def interrupted_run(self, *records):
+        """Leave a journal behind as if the run died after writing `records`"""
+        run = CrawlJournal(self.path)
+        run.start()
+        for record in records:
+            run.record(*record)
+        run.close()
+
+    def test_resume_keeps_finished_jobs(self):
+        self.interrupted_run((job("x"), meta(), "fetched"), (job("y"), None, "failed", "timeout"))
+        resumed = CrawlJournal(self.path).resume(3600)
+        self.assertEqual(list(resumed), ["x"])
+        self.assertEqual(resumed["x"]["descriptionHashes"], ["a"])
+
+    def test_a_later_failure_drops_the_job(self):
+        self.interrupted_run((job("x"), meta(), "fetched"), (job("x"), meta(), "failed", "timeout"))
+        self.assertEqual(CrawlJournal(self.path).resume(3600), {})
+
+    def test_torn_last_line_is_ignored(self):
+        self.interrupted_run((job("x"), meta(), "fetched"))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "job", "jobviteId": "y", "jobTi')
+        self.assertEqual(list(CrawlJournal(self.path).resume(3600)), ["x"])
+
+        # Appending after the torn line must not glue the next record onto it
+        run = CrawlJournal(self.path)
+        run.start(resuming=True)
+        run.record(job("y"), meta(hashes=("b",)), "fetched")
+        jobs = run.compact([job("x"), job("y")])
+        self.assertEqual([entry["descriptionHashes"] for entry in jobs], [["a"], ["b"]])
+
+    def test_old_journal_is_not_resumed(self):
+        self.interrupted_run((job("x"), meta(), "fetched"))
+        with mock.patch.object(journal.time, "time", return_value=time.time() + 7200):
+            self.assertEqual(CrawlJournal(self.path).resume(3600), {})
+
+    def test_missing_journal(self):
+        self.assertEqual(CrawlJournal(self.path).resume(3600), {})
+
+    def test_compact_merges_cached_jobs_in_list_order(self):
+        run = CrawlJournal(self.path)
+        run.start()
+        run.record(job("y"), meta(hashes=("b",)), "fetched")
+        run.record(job("gone"), meta(), "fetched")
+        jobs = run.compact([job("x"), job("y"), job("z")], {"x": dict(meta(hashes=("c",)), jobTitle="Old")})
+        self.assertEqual([entry["jobviteId"] for entry in jobs], ["x", "y", "z"])
+        self.assertEqual([entry["descriptionHashes"] for entry in jobs], [["c"], ["b"], []])
+        self.assertEqual(jobs[0]["jobTitle"], "Engineer")
+        self.assertIsNone(jobs[2]["fetchedAt"])
+
+    def test_finish_removes_the_journal(self):
+        self.interrupted_run((job("x"), meta(), "fetched"))
+        CrawlJournal(self.path).finish()
+        self.assertFalse(os.path.exists(self.path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from unittest import mock
+import ratelimit
+from ratelimit import HostRateLimiter, TokenBucket
+
+class FakeClock:
+    """time.monotonic and time.sleep that only move when slept on"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+class TokenBucketTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(ratelimit.time, monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        waits = [bucket.acquire() for _ in range(5)]
+        self.assertEqual(waits, [0.0, 0.0, 0.0, 0.5, 0.5])
+
+    def test_idle_time_refills_up_to_the_burst(self):
+        bucket = TokenBucket(rate=2, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.clock.now += 60
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.5])
+
+    def test_hosts_have_separate_buckets(self):
+        limiter = HostRateLimiter(rate=1, burst=1)
+        limiter.acquire("https://jobs.jobvite.com/a/")
+        limiter.acquire("https://other.example/")
+        self.assertEqual(self.clock.slept, [])
+        limiter.acquire("https://jobs.jobvite.com/a/job/x")
+        self.assertEqual(self.clock.slept, [1.0])
+
+    def test_zero_rate_disables_the_limit(self):
+        limiter = HostRateLimiter(rate=0)
+        for _ in range(100):
+            limiter.acquire("https://jobs.jobvite.com/")
+        self.assertEqual(self.clock.slept, [])
+
+if __name__ == "__main__":
+    unittest.main()
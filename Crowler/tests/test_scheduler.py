@@ -0,0 +1,75 @@
+import time
+import threading
+import unittest
+from datetime import datetime, timedelta
+from scheduler import CronSchedule, FixedRateSchedule, SyncScheduler, parse_schedule
+
+class CronScheduleTest(unittest.TestCase):
+    def next_run(self, expression, now):
+        return CronSchedule(expression).next_after(now, now)
+
+    def test_every_fifteen_minutes(self):
+        self.assertEqual(self.next_run("*/15 * * * *", datetime(2025, 3, 4, 10, 7, 30)), datetime(2025, 3, 4, 10, 15))
+
+    def test_exact_match_moves_to_the_next_one(self):
+        self.assertEqual(self.next_run("0 6 * * *", datetime(2025, 3, 4, 6, 0)), datetime(2025, 3, 5, 6, 0))
+
+    def test_weekdays_across_a_weekend(self):
+        # 2025-03-07 is a Friday
+        self.assertEqual(self.next_run("30 9 * * 1-5", datetime(2025, 3, 7, 10, 0)), datetime(2025, 3, 10, 9, 30))
+
+    def test_sunday_is_0_or_7(self):
+        self.assertEqual(self.next_run("0 0 * * 7", datetime(2025, 3, 4)), datetime(2025, 3, 9))
+        self.assertEqual(self.next_run("0 0 * * 0", datetime(2025, 3, 4)), datetime(2025, 3, 9))
+
+    def test_restricted_day_and_weekday_match_either(self):
+        # The 1st or any Monday, whichever comes first
+        self.assertEqual(self.next_run("0 3 1 * 1", datetime(2025, 3, 4)), datetime(2025, 3, 10, 3, 0))
+
+    def test_month_and_year_rollover(self):
+        self.assertEqual(self.next_run("0 0 29 2 *", datetime(2025, 3, 1)), datetime(2028, 2, 29))
+        self.assertEqual(self.next_run("15 4 1 1 *", datetime(2025, 12, 31, 23, 59)), datetime(2026, 1, 1, 4, 15))
+
+    def test_invalid_expressions(self):
+        for expression in ("* * * *", "60 * * * *", "* 24 * * *", "*/0 * * * *", "5-1 * * * *", "0 0 31 2 *"):
+            with self.subTest(expression=expression), self.assertRaises(ValueError):
+                self.next_run(expression, datetime(2025, 1, 1))
+
+class FixedRateScheduleTest(unittest.TestCase):
+    def test_start_to_start(self):
+        schedule = FixedRateSchedule(3600)
+        start = datetime(2025, 3, 4, 10, 0)
+        self.assertEqual(schedule.next_after(start, start + timedelta(minutes=20)), datetime(2025, 3, 4, 11, 0))
+
+    def test_missed_slots_are_skipped(self):
+        schedule = FixedRateSchedule(3600)
+        start = datetime(2025, 3, 4, 10, 0)
+        self.assertEqual(schedule.next_after(start, datetime(2025, 3, 4, 12, 30)), datetime(2025, 3, 4, 13, 0))
+
+    def test_parse_schedule(self):
+        self.assertEqual(parse_schedule("every 30m").interval, timedelta(minutes=30))
+        self.assertEqual(parse_schedule("6h").interval, timedelta(hours=6))
+        self.assertIsInstance(parse_schedule("0 */6 * * *"), CronSchedule)
+
+class SyncSchedulerTest(unittest.TestCase):
+    def test_trigger_takes_the_next_fixed_rate_slot(self):
+        runs = []
+        scheduler = SyncScheduler(lambda phases: runs.append(time.monotonic()) or (),
+                                  FixedRateSchedule(1.0), run_on_start=False)
+        thread = threading.Thread(target=scheduler.run_forever, daemon=True)
+        thread.start()
+        try:
+            # The first scheduled run is due at 1.0s; a trigger at 0.6s moves it to 1.6s
+            time.sleep(0.6)
+            scheduler.trigger("test")
+            time.sleep(0.7)
+            self.assertEqual(len(runs), 1)
+            time.sleep(0.6)
+            self.assertEqual(len(runs), 2)
+            self.assertGreaterEqual(runs[1] - runs[0], 0.9)
+        finally:
+            scheduler.stop()
+            thread.join()
+
+if __name__ == "__main__":
+    unittest.main()
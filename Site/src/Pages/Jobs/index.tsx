@@ -1,15 +1,51 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useMemo } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { getJobs } from '../../services/data';
+import { getFacets, getJobs, searchJobs } from '../../services/data';
 import './styles.css';
 import logo from '../../assets/LeanTechLogo.svg';
-import type { JobsResponse } from '../../../types';
+import type { Facets, JobsResponse } from '../../../types';
+
+type FacetName = keyof Facets;
+
+const FACET_LABELS: Record<FacetName, string> = {
+  sector: 'All sectors',
+  workMode: 'All work modes',
+  country: 'All countries',
+};
 
 const Jobs = () => {
   const navigate = useNavigate();
   const [jobs, setJobs] = useState<JobsResponse>({ jobs: [], lastUpdated: '' });
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [query, setQuery] = useState('');
+  const [matchingIds, setMatchingIds] = useState<Set<string> | null>(null);
+  const [facets, setFacets] = useState<Facets | null>(null);
+  const [filters, setFilters] = useState<Record<FacetName, string>>({ sector: '', workMode: '', country: '' });
+
+  useEffect(() => {
+    // Filters are optional: without facets.json the list still works
+    getFacets().then(setFacets).catch((err) => console.error('Error fetching facets:', err));
+  }, []);
+
+  useEffect(() => {
+    if (!query.trim()) {
+      setMatchingIds(null);
+      return;
+    }
+
+    let current = true;
+    searchJobs(query)
+      .then((ids) => { if (current) setMatchingIds(new Set(ids)); })
+      .catch((err) => console.error('Error searching jobs:', err));
+    // A slower, older search must not overwrite the results of the latest query
+    return () => { current = false; };
+  }, [query]);
+
+  const visibleJobs = useMemo(() => jobs.jobs.filter((job) =>
+    (!matchingIds || matchingIds.has(job.jobviteId)) &&
+    (Object.keys(filters) as FacetName[]).every((facet) => !filters[facet] || job[facet] === filters[facet])
+  ), [jobs, matchingIds, filters]);
 
   useEffect(() => {
     const fetchJobs = async () => {
@@ -64,11 +100,38 @@ const Jobs = () => {
         <img src={logo} alt="Lean Tech" className="logo" />
       </a>
       
+      {jobs.jobs.length > 0 && (
+        <div className="jobs-filters">
+          <input
+            type="search"
+            className="jobs-search"
+            placeholder="Search jobs, e.g. python remote"
+            value={query}
+            onChange={(event) => setQuery(event.target.value)}
+          />
+          {facets && (Object.keys(FACET_LABELS) as FacetName[]).map((facet) => (
+            <select
+              key={facet}
+              className="jobs-facet"
+              value={filters[facet]}
+              onChange={(event) => setFilters({ ...filters, [facet]: event.target.value })}
+            >
+              <option value="">{FACET_LABELS[facet]}</option>
+              {Object.entries(facets[facet]).map(([value, count]) => (
+                <option key={value} value={value}>{value} ({count})</option>
+              ))}
+            </select>
+          ))}
+        </div>
+      )}
+
       {jobs.jobs.length === 0 ? (
         <p className="no-jobs-message">No jobs available at the moment.</p>
+      ) : visibleJobs.length === 0 ? (
+        <p className="no-jobs-message">No jobs match your search.</p>
       ) : (
         <div className="jobs-grid">
-          {jobs.jobs.map((job) => (
+          {visibleJobs.map((job) => (
             <div key={job.jobviteId} className="job-card">
               <div className="job-header">
                 <h2 className="job-title">
@@ -95,7 +158,9 @@ const Jobs = () => {
       )}
       
       <div className="jobs-counter">
-        Total jobs: {jobs.jobs.length}
+        {visibleJobs.length === jobs.jobs.length
+          ? `Total jobs: ${jobs.jobs.length}`
+          : `Showing ${visibleJobs.length} of ${jobs.jobs.length} jobs`}
       </div>
       <div className="jobs-counter">
         Last updated: {jobs.lastUpdated}
@@ -1,11 +1,14 @@
 import axios from 'axios'
-import type { Job, JobsResponse } from '../../types'
+import type { Facets, Job, JobsResponse, SearchIndex } from '../../types'
 
 const api = axios.create({
     baseURL: '',
 })
 
 let jobs: JobsResponse
+const shards: Record<string, Job> = {}
+let searchIndex: Promise<SearchIndex> | undefined
+let facets: Promise<Facets> | undefined
 
 export const getJobs = async () : Promise<JobsResponse> => {
     if (!jobs) {
@@ -16,15 +19,73 @@ export const getJobs = async () : Promise<JobsResponse> => {
     return jobs;
 }
 
+// Loads one record from its shard (jobs/{id}.json) unless the full list is already cached
+const findJob = async (id: string) : Promise<Job | undefined> => {
+    if (jobs) {
+        return jobs.jobs.find((job) => job.jobviteId === id);
+    }
+
+    if (!shards[id]) {
+        try {
+            const response = await api.get(`/jobs/${id}.json`);
+            shards[id] = response.data;
+        } catch {
+            const jobs = await getJobs();
+            return jobs.jobs.find((job) => job.jobviteId === id);
+        }
+    }
+
+    return shards[id];
+}
+
 export const getJob = async (id: string) : Promise<Job | null> => {
-    const jobs = await getJobs();
-    const job = jobs.jobs.find((job) => job.jobviteId === id);
+    const job = await findJob(id);
 
     if (job && !job.jobDescription)
     {
-        const response = await api.get(`/jobs/${id}.html`);
-        job.jobDescription = response.data;
+        // A description is a list of immutable fragments, shared between postings and cached for good
+        const fragments = await Promise.all((job.descriptionHashes || []).map((hash) =>
+            api.get(`/blobs/${hash}.html`, { responseType: 'text' })));
+        job.jobDescription = fragments.map((response) => response.data).join('');
     }
 
     return job || null;
+}
+
+// Facet counts are precomputed by the crawler, so filters never scan the job list
+export const getFacets = async () : Promise<Facets> => {
+    if (!facets) {
+        facets = api.get('/facets.json').then((response) => response.data);
+    }
+
+    return facets;
+}
+
+// Must match searchindex.tokenize in the crawler
+const tokenize = (text: string, stopwords: string[]) : string[] =>
+    (text.toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '').match(/[\p{L}\p{N}_]+/gu) || [])
+        .filter((token) => token.length > 1 && !stopwords.includes(token));
+
+// Returns the ids of jobs matching every query word; the last word also matches as a prefix
+export const searchJobs = async (query: string) : Promise<string[]> => {
+    if (!searchIndex) {
+        searchIndex = api.get('/search-index.json').then((response) => response.data);
+    }
+    const index = await searchIndex;
+    const tokens = tokenize(query, index.stopwords);
+
+    if (tokens.length === 0) {
+        return index.ids;
+    }
+
+    let matches: number[] = index.ids.map((_, position) => position);
+    for (const [i, token] of tokens.entries()) {
+        const terms = i === tokens.length - 1
+            ? Object.keys(index.terms).filter((term) => term.startsWith(token))
+            : [token];
+        const positions = new Set(terms.flatMap((term) => index.terms[term] || []));
+        matches = matches.filter((position) => positions.has(position));
+    }
+
+    return matches.map((position) => index.ids[position]);
 }
\ No newline at end of file
@@ -2,6 +2,8 @@ export type Job = {
     jobviteId: string;
     jobTitle: string;
     jobDescription?: string;
+    descriptionHashes: string[];
+    fetchedAt: number | null;
     sector: string;
     workMode: string;
     country: string;
@@ -10,4 +12,16 @@ export type Job = {
 export type JobsResponse = {
     jobs: Job[];
     lastUpdated: string;
-}
\ No newline at end of file
+}
+
+export type SearchIndex = {
+    ids: string[];
+    stopwords: string[];
+    terms: Record<string, number[]>;
+}
+
+export type Facets = {
+    sector: Record<string, number>;
+    workMode: Record<string, number>;
+    country: Record<string, number>;
+}